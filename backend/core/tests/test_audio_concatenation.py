@@ -0,0 +1,54 @@
+"""
+Test streaming audio concatenation
+"""
+
+import sys
+import pytest
+from pathlib import Path
+
+# Add the backend directory to the path so we can import modules
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+np = pytest.importorskip("numpy")
+sf = pytest.importorskip("soundfile")
+
+from backend.core.utils.file_utils import stream_concatenate_audio_files
+
+
+class TestStreamConcatenateAudioFiles:
+    """Test class for stream_concatenate_audio_files"""
+
+    def test_float_and_pcm16_sources(self, tmp_path):
+        """Float WAVs (e.g. from torchaudio.save) must not come out silent"""
+        samplerate = 24000
+        tone = 0.5 * np.sin(np.linspace(0, 200 * np.pi, samplerate)).astype("float32")
+
+        float_path = tmp_path / "float.wav"
+        pcm_path = tmp_path / "pcm16.wav"
+        output_path = tmp_path / "out.wav"
+        sf.write(float_path, tone, samplerate, subtype="FLOAT")
+        sf.write(pcm_path, tone, samplerate, subtype="PCM_16")
+
+        assert stream_concatenate_audio_files(
+            [str(float_path), str(pcm_path)], str(output_path)
+        )
+
+        audio, sr = sf.read(output_path, dtype="float32")
+        assert sr == samplerate
+        assert sf.info(output_path).subtype == "PCM_16"
+        assert len(audio) == 2 * len(tone)
+        np.testing.assert_allclose(audio[: len(tone)], tone, atol=1e-3)
+        np.testing.assert_allclose(audio[len(tone) :], tone, atol=1e-3)
+
+    def test_mismatched_samplerates(self, tmp_path):
+        """Sources with different sample rates are left to the in-memory path"""
+        first, second = tmp_path / "a.wav", tmp_path / "b.wav"
+        output_path = tmp_path / "out.wav"
+        sf.write(first, np.zeros(100, dtype="float32"), 24000)
+        sf.write(second, np.zeros(100, dtype="float32"), 44100)
+
+        assert not stream_concatenate_audio_files(
+            [str(first), str(second)], str(output_path)
+        )
+        assert not output_path.exists()
@@ -304,7 +304,6 @@ def write_dropped_file(file_data: bytes, filename: str) -> Path:
 
 
 try:
-    import librosa
     import soundfile as sf
     import numpy as np
     from urllib.parse import unquote
@@ -329,6 +328,13 @@ def concatenate_audio_files(
     if not audio_paths:
         return None
 
+    # librosa is only needed for resampling, so it is imported on first use
+    try:
+        import librosa
+    except ImportError as e:
+        print(f"Error importing librosa: {e}")
+        return None
+
     concatenated_audio = []
 
     for audio_path in audio_paths:
@@ -351,3 +357,51 @@ def concatenate_audio_files(
 
     # Concatenate all audio arrays
     return np.concatenate(concatenated_audio)
+
+
+def stream_concatenate_audio_files(
+    audio_paths: List[str],
+    output_path: str,
+    file_root: str = "root",
+    blocksize: int = 65536,
+) -> bool:
+    """
+    Concatenate audio files straight into a PCM_16 file at output_path,
+    streaming block by block with soundfile instead of loading whole signals.
+
+    Returns False without writing anything if the files can't be read or don't
+    share a sample rate and channel count; concatenate_audio_files resamples
+    those cases in memory.
+    """
+    if not AUDIO_LIBS_AVAILABLE or not audio_paths:
+        return False
+
+    resolved_paths = []
+    for audio_path in audio_paths:
+        dir, filename = resolve_file_path(unquote(audio_path), file_root)
+        resolved_paths.append(dir / filename)
+
+    try:
+        infos = [sf.info(path) for path in resolved_paths]
+    except RuntimeError:
+        return False
+
+    samplerate, channels = infos[0].samplerate, infos[0].channels
+    if any(i.samplerate != samplerate or i.channels != channels for i in infos):
+        return False
+
+    with sf.SoundFile(
+        output_path,
+        mode="w",
+        samplerate=samplerate,
+        channels=channels,
+        subtype="PCM_16",
+    ) as out:
+        for path in resolved_paths:
+            with sf.SoundFile(path) as src:
+                # Read as float so FLOAT/DOUBLE sources are scaled (libsndfile
+                # doesn't scale float -> int on read); the writer converts
+                for block in src.blocks(blocksize=blocksize, dtype="float32"):
+                    out.write(np.clip(block, -1.0, 1.0))
+
+    return True
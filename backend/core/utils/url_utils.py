@@ -6,6 +6,7 @@ slashes and special characters in URL path parameters.
 """
 
 from base64 import b64decode, b64encode
+import functools
 import os
 import urllib.parse
 
@@ -17,6 +18,7 @@ def encode_filepath_for_url(file_path: str) -> str:
     return b64encode(file_path.encode("utf-8")).decode("utf-8")
 
 
+@functools.lru_cache(maxsize=1024)
 def decode_filepath_from_url(encoded_path: str) -> str:
     if not encoded_path:
         return ""
@@ -6,11 +6,18 @@ A FastAPI service for the Dia model that provides ElevenLabs-compatible endpoint
 Note: Dia only supports multi-speaker dialogue generation, not single-speaker TTS.
 """
 
+import asyncio
+import concurrent.futures
+import functools
 import gc
 import logging
 import os
 import tempfile
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from typing import Dict, List, Optional, Any
 from urllib.parse import unquote
 
@@ -30,7 +37,6 @@ project_root = os.path.dirname(
 sys.path.append(project_root)
 
 from backend.core.utils.file_utils import concatenate_audio_files
-from backend.core.utils.url_utils import decode_filepath_from_url
 from models.shared_models import (
     DialogueInput,
     TextToSpeechRequest,
@@ -65,10 +71,25 @@ MODEL = None
 PROCESSOR = None
 MODEL_CHECKPOINT = "nari-labs/Dia-1.6B-0626"
 
-app = FastAPI(title="Dia Text-to-Dialogue Service", version="1.0.0")
+# Leave headroom so bursty load doesn't fragment the allocator into an OOM
+if torch.cuda.is_available():
+    torch.cuda.set_per_process_memory_fraction(0.9)
 
+# Bounded pool for blocking file/audio work so it can overlap with generation
+_IO_POOL = concurrent.futures.ThreadPoolExecutor(
+    max_workers=min(8, (os.cpu_count() or 2) * 2), thread_name_prefix="dia-io"
+)
+
+# Concatenated voice prompts keyed on (path, mtime) of each voice, most recent last
+_CONCAT_CACHE_SIZE = 16
+_CONCAT_CACHE = OrderedDict()
+_CONCAT_CACHE_LOCK = threading.Lock()
 
-from model_shared_utils import resolve_file_path
+from model_shared_utils import (
+    get_speaker_mapping,
+    path_exists,
+    resolve_voice_path,
+)
 
 
 # Helper functions
@@ -82,6 +103,30 @@ def load_audio_prompt(audio_path: str, target_sr: int = 44100):
         return None
 
 
+def get_concatenated_audio_prompt(voice_paths: List[str]):
+    """Concatenate voice prompts, reusing the result for a recently seen speaker set."""
+    try:
+        key = tuple((path, os.stat(path).st_mtime_ns) for path in voice_paths)
+    except OSError:
+        return concatenate_audio_files(voice_paths)
+
+    with _CONCAT_CACHE_LOCK:
+        if key in _CONCAT_CACHE:
+            _CONCAT_CACHE.move_to_end(key)
+            return _CONCAT_CACHE[key]
+
+    concatenated_audio = concatenate_audio_files(voice_paths)
+
+    if concatenated_audio is not None:
+        with _CONCAT_CACHE_LOCK:
+            _CONCAT_CACHE[key] = concatenated_audio
+            _CONCAT_CACHE.move_to_end(key)
+            while len(_CONCAT_CACHE) > _CONCAT_CACHE_SIZE:
+                _CONCAT_CACHE.popitem(last=False)
+
+    return concatenated_audio
+
+
 def format_dialogue_text(texts: List[str], voice_paths: List[str] = None) -> str:
     """Format dialogue texts with speaker tags."""
     if not texts:
@@ -91,25 +136,26 @@ def format_dialogue_text(texts: List[str], voice_paths: List[str] = None) -> str
     print(f"Texts: {texts}")
     # Generate automatic speaker mapping based on voice_paths
     if voice_paths and len(voice_paths) == len(texts):
-        voice_to_speaker = {}
-        speaker_counter = 0
-        speaker_mapping = []
-
-        for voice_path in voice_paths:
-            if voice_path not in voice_to_speaker:
-                voice_to_speaker[voice_path] = speaker_counter
-                speaker_counter += 1
-            speaker_mapping.append(voice_to_speaker[voice_path])
+        speaker_mapping = get_speaker_mapping(voice_paths)
     else:
         # Default to alternating speakers
         speaker_mapping = [i % 2 for i in range(len(texts))]
 
-    dialogue_parts = []
-    for text, speaker_idx in zip(texts, speaker_mapping):
-        speaker_tag = f"[S{speaker_idx + 1}]"
-        dialogue_parts.append(f"{speaker_tag} {text.strip()}")
+    return " ".join(
+        f"[S{speaker_idx + 1}] {text.strip()}"
+        for text, speaker_idx in zip(texts, speaker_mapping)
+    )
+
+
+def move_inputs_to_device(inputs):
+    """Move processor outputs to DEVICE, staging through pinned memory on CUDA."""
+    if DEVICE != "cuda":
+        return inputs.to(DEVICE)
 
-    return " ".join(dialogue_parts)
+    return {
+        k: v.pin_memory().to(DEVICE, non_blocking=True) if torch.is_tensor(v) else v
+        for k, v in inputs.items()
+    }
 
 
 def get_or_load_model():
@@ -124,7 +170,14 @@ def get_or_load_model():
 
         logger.info("Loading DIA model...")
         PROCESSOR = AutoProcessor.from_pretrained(MODEL_CHECKPOINT)
-        MODEL = DiaForConditionalGeneration.from_pretrained(MODEL_CHECKPOINT).to(DEVICE)
+        # Stream weights straight onto the target device (via accelerate) instead
+        # of materialising a full fp32 copy in CPU RAM and then moving it.
+        MODEL = DiaForConditionalGeneration.from_pretrained(
+            MODEL_CHECKPOINT,
+            device_map={"": DEVICE},
+            torch_dtype=torch.bfloat16 if DEVICE == "cuda" else torch.float32,
+            low_cpu_mem_usage=True,
+        )
         logger.info(f"DIA model loaded on device: {DEVICE}")
 
     return MODEL, PROCESSOR
@@ -154,8 +207,33 @@ def unload_model():
     return False
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: load the model before accepting traffic
+    if DIA_AVAILABLE:
+        get_or_load_model()
+
+    yield
+
+    # Shutdown
+    unload_model()
+
+
+app = FastAPI(
+    title="Dia Text-to-Dialogue Service", version="1.0.0", lifespan=lifespan
+)
+
+
 MODEL_NAME = "Dia"
 
+# Model metadata that never changes, reported by /v1/models
+_STATIC_MODEL_INFO = {
+    "id": MODEL_NAME,
+    "owned_by": "custom",
+    "device": DEVICE,
+    "dependencies_available": DIA_AVAILABLE,
+}
+
 
 # API Endpoints
 @app.get("/", response_model=ServiceInfoResponse)
@@ -178,21 +256,24 @@ async def text_to_speech(voice_id: str, request: TextToSpeechRequest):
 @app.post("/v1/text-to-dialogue", response_model=GenerationResponse)
 async def text_to_dialogue(request: TextToDialogueRequest):
     """Generate multi-speaker dialogue audio using Dia model."""
+    # Model is loaded at startup (or via /v1/load-model)
+    model, processor = MODEL, PROCESSOR
+    if model is None:
+        raise HTTPException(status_code=503, detail="Dia model not loaded")
+
     try:
-        # Load model
-        model, processor = get_or_load_model()
-
-        # Extract texts and voice paths
-        texts = request.audio_transcriptions
-        for inp in request.inputs:
-            texts.append(inp.text)
-        # texts = [inp.text for inp in request.inputs]
-        voice_paths = request.voice_clone_paths
-        for inp in request.inputs:
-            voice_paths.append(inp.voice_id)
+        loop = asyncio.get_running_loop()
+
+        # Extract texts and voice paths, prefixed by the voice clone prompts
+        texts, voice_ids = (
+            map(list, zip(*((inp.text, inp.voice_id) for inp in request.inputs)))
+            if request.inputs
+            else ([], [])
+        )
+        texts = request.audio_transcriptions + texts
         voice_paths = [
-            resolve_file_path(decode_filepath_from_url(vp), project_root)
-            for vp in voice_paths
+            resolve_voice_path(vp, project_root)
+            for vp in request.voice_clone_paths + voice_ids
         ]
 
         # Format dialogue text with speaker tags
@@ -214,69 +295,63 @@ async def text_to_dialogue(request: TextToDialogueRequest):
 
         print(f"Voice paths: {voice_paths}")
         # Check if we have voice clone paths for multi-speaker generation
-        if voice_paths and all(os.path.exists(path) for path in voice_paths):
+        concatenated_audio = None
+        if voice_paths and all(path_exists(path) for path in voice_paths):
             logger.info("Using voice cloning with audio prompts")
 
-            # Get unique voice paths
-            unique_voice_paths = []
-            seen_voices = set()
-            for voice_path in voice_paths:
-                if voice_path not in seen_voices:
-                    unique_voice_paths.append(voice_path)
-                    seen_voices.add(voice_path)
+            # Get unique voice paths, in speaker order
+            unique_voice_paths = list(dict.fromkeys(voice_paths))
 
             # Create concatenated audio prompt using unique voices
-            concatenated_audio = concatenate_audio_files(unique_voice_paths)
-
-            if concatenated_audio is not None:
-                # Process inputs with concatenated audio prompt
-                inputs = processor(
-                    text=[dialogue_text],
-                    audio=concatenated_audio,
-                    padding=True,
-                    return_tensors="pt",
-                ).to(DEVICE)
-
-                # Get audio prompt length for proper decoding
-                prompt_len = processor.get_audio_prompt_len(
-                    inputs["decoder_attention_mask"]
-                )
-
-                logger.info(f"Actual text sent to Dia: {dialogue_text}")
-
-                # Generate audio
-                outputs = model.generate(**inputs, **gen_kwargs)
-
-                # Decode generated audio (excluding prompt)
-                generated_audio = processor.batch_decode(
-                    outputs, audio_prompt_len=prompt_len
-                )
-            else:
+            concatenated_audio = await loop.run_in_executor(
+                _IO_POOL, get_concatenated_audio_prompt, unique_voice_paths
+            )
+            if concatenated_audio is None:
                 logger.warning(
                     "Failed to load voice clones, falling back to text-only generation"
                 )
-                inputs = processor(
-                    text=[dialogue_text], padding=True, return_tensors="pt"
-                ).to(DEVICE)
-                outputs = model.generate(**inputs, **gen_kwargs)
-                generated_audio = processor.batch_decode(outputs)
         else:
-            # Text-only generation
             logger.info("Using text-only generation (no valid voice clones)")
-            inputs = processor(
-                text=[dialogue_text], padding=True, return_tensors="pt"
-            ).to(DEVICE)
-            outputs = model.generate(**inputs, **gen_kwargs)
+
+        # Process inputs, with the concatenated audio prompt when we have one
+        processor_kwargs = {
+            "text": [dialogue_text],
+            "padding": True,
+            "return_tensors": "pt",
+        }
+        if concatenated_audio is not None:
+            processor_kwargs["audio"] = concatenated_audio
+        inputs = move_inputs_to_device(processor(**processor_kwargs))
+
+        logger.info(f"Actual text sent to Dia: {dialogue_text}")
+
+        # Generate audio
+        outputs = model.generate(**inputs, **gen_kwargs)
+
+        if concatenated_audio is not None:
+            # Decode generated audio (excluding prompt)
+            prompt_len = processor.get_audio_prompt_len(
+                inputs["decoder_attention_mask"]
+            )
+            generated_audio = processor.batch_decode(
+                outputs, audio_prompt_len=prompt_len
+            )
+        else:
             generated_audio = processor.batch_decode(outputs)
 
         # Save generated audio to specified filepath
         output_path = request.output_filepath
 
         # Create output directory if it doesn't exist
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        await loop.run_in_executor(
+            _IO_POOL,
+            functools.partial(os.makedirs, os.path.dirname(output_path), exist_ok=True),
+        )
 
         # Save audio using processor
-        processor.save_audio(generated_audio, output_path)
+        await loop.run_in_executor(
+            _IO_POOL, processor.save_audio, generated_audio, output_path
+        )
 
         logger.info(f"Successfully generated dialogue audio: {output_path}")
         return GenerationResponse(
@@ -322,17 +397,11 @@ async def unload_model_endpoint():
 @app.get("/v1/models", response_model=OpenAIModelsResponse)
 async def list_models():
     """OpenAI-compatible models endpoint with health data."""
-    import time
-
-    model_loaded = MODEL is not None
     model_data = OpenAIModel(
-        id=MODEL_NAME,
+        **_STATIC_MODEL_INFO,
         created=int(time.time()),
-        owned_by="custom",
         status="healthy",
-        model_loaded=model_loaded,
-        device=DEVICE,
-        dependencies_available=DIA_AVAILABLE,
+        model_loaded=MODEL is not None,
     )
 
     return OpenAIModelsResponse(data=[model_data])
@@ -6,11 +6,16 @@ A FastAPI service for the Higgs audio model that provides ElevenLabs-compatible
 Supports both single-speaker TTS and multi-speaker dialogue generation.
 """
 
+import asyncio
+import concurrent.futures
+import functools
 import gc
 import logging
 import os
 import re
+import time
 import uuid
+from contextlib import asynccontextmanager
 from typing import Dict, List, Optional, Any
 from urllib.parse import unquote
 
@@ -69,9 +74,19 @@ MODEL = None
 MODEL_PATH = "bosonai/higgs-audio-v2-generation-3B-base"
 AUDIO_TOKENIZER_PATH = "bosonai/higgs-audio-v2-tokenizer"
 
-app = FastAPI(title="Higgs Audio Generation Service", version="1.0.0")
+# Bounded pool for blocking file/audio work so it can overlap with generation
+_IO_POOL = concurrent.futures.ThreadPoolExecutor(
+    max_workers=min(8, (os.cpu_count() or 2) * 2), thread_name_prefix="higgs-io"
+)
+
+from model_shared_utils import (
+    get_speaker_mapping,
+    path_exists,
+    resolve_file_path,
+    resolve_voice_path,
+)
 
-from model_shared_utils import resolve_file_path
+_SPEAKER_TAG_RE = re.compile(r"\[SPEAKER\d+\]")
 
 
 def get_or_load_model():
@@ -113,6 +128,23 @@ def unload_model():
     return False
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: load the model before accepting traffic
+    if HIGGS_AVAILABLE:
+        get_or_load_model()
+
+    yield
+
+    # Shutdown
+    unload_model()
+
+
+app = FastAPI(
+    title="Higgs Audio Generation Service", version="1.0.0", lifespan=lifespan
+)
+
+
 def prepare_single_speaker_messages(
     text: str,
     scene_prompt: str,
@@ -158,23 +190,32 @@ def prepare_multi_speaker_messages(
     """Prepare ChatML messages for multi-speaker generation."""
     messages = []
 
-    # Build system message with speaker descriptions
+    # Build system message with speaker descriptions, collecting the voice
+    # clone examples for each unique voice in the same pass
     speaker_descriptions = []
+    voice_clone_messages = []
     if voice_clone_paths and audio_transcriptions:
-        # Create speaker mapping based on unique voice clones
-        unique_voices = {}
-        speaker_counter = 0
-
+        unique_voices = set()
         for i, voice_path in enumerate(voice_clone_paths):
-            if voice_path not in unique_voices:
-                unique_voices[voice_path] = speaker_counter
-                transcription = (
-                    audio_transcriptions[i] if i < len(audio_transcriptions) else ""
-                )
-                speaker_descriptions.append(
-                    f"SPEAKER{speaker_counter}: {transcription}"
+            if voice_path in unique_voices:
+                continue
+            speaker_id = len(unique_voices)
+            unique_voices.add(voice_path)
+            transcription = (
+                audio_transcriptions[i] if i < len(audio_transcriptions) else ""
+            )
+            speaker_descriptions.append(f"SPEAKER{speaker_id}: {transcription}")
+            voice_clone_messages.append(
+                Message(role="user", content=f"[SPEAKER{speaker_id}] {transcription}")
+            )
+            voice_clone_messages.append(
+                Message(
+                    role="assistant",
+                    content=AudioContent(
+                        audio_url=resolve_file_path(voice_path, project_root)
+                    ),
                 )
-                speaker_counter += 1
+            )
     else:
         # Default speaker descriptions
         speaker_tags = extract_speaker_tags(texts)
@@ -187,29 +228,7 @@ def prepare_multi_speaker_messages(
     messages.append(Message(role="system", content=system_content))
 
     # Add voice clone examples if available
-    if voice_clone_paths and audio_transcriptions:
-        unique_voices = {}
-        for i, voice_path in enumerate(voice_clone_paths):
-            if voice_path not in unique_voices:
-                unique_voices[voice_path] = True
-                transcription = (
-                    audio_transcriptions[i] if i < len(audio_transcriptions) else ""
-                )
-                speaker_id = len(unique_voices) - 1
-
-                messages.append(
-                    Message(
-                        role="user", content=f"[SPEAKER{speaker_id}] {transcription}"
-                    )
-                )
-                messages.append(
-                    Message(
-                        role="assistant",
-                        content=AudioContent(
-                            audio_url=resolve_file_path(voice_path, project_root)
-                        ),
-                    )
-                )
+    messages.extend(voice_clone_messages)
 
     # Combine all texts with speaker tags
     combined_text = format_multi_speaker_text(texts, voice_clone_paths)
@@ -239,31 +258,32 @@ def format_multi_speaker_text(
 
     # Generate speaker mapping based on voice clone paths if available
     if voice_clone_paths and len(voice_clone_paths) == len(texts):
-        voice_to_speaker = {}
-        speaker_counter = 0
-        speaker_mapping = []
-
-        for voice_path in voice_clone_paths:
-            if voice_path not in voice_to_speaker:
-                voice_to_speaker[voice_path] = speaker_counter
-                speaker_counter += 1
-            speaker_mapping.append(voice_to_speaker[voice_path])
+        speaker_mapping = get_speaker_mapping(voice_clone_paths)
     else:
         # Default to sequential speakers
-        speaker_mapping = list(range(len(texts)))
-
-    formatted_parts = []
-    for text, speaker_idx in zip(texts, speaker_mapping):
-        # Check if text already has speaker tags
-        if not re.search(r"\[SPEAKER\d+\]", text):
-            text = f"[SPEAKER{speaker_idx}] {text.strip()}"
-        formatted_parts.append(text)
-
-    return "\n".join(formatted_parts)
+        speaker_mapping = range(len(texts))
+
+    # Leave texts that already carry speaker tags untouched
+    return "\n".join(
+        (
+            text
+            if _SPEAKER_TAG_RE.search(text)
+            else f"[SPEAKER{speaker_idx}] {text.strip()}"
+        )
+        for text, speaker_idx in zip(texts, speaker_mapping)
+    )
 
 
 MODEL_NAME = "Higgs"
 
+# Model metadata that never changes, reported by /v1/models
+_STATIC_MODEL_INFO = {
+    "id": MODEL_NAME,
+    "owned_by": "custom",
+    "device": DEVICE,
+    "dependencies_available": HIGGS_AVAILABLE,
+}
+
 
 # API Endpoints
 @app.get("/", response_model=ServiceInfoResponse)
@@ -274,6 +294,11 @@ async def root():
 @app.post("/v1/text-to-speech/{voice_id}", response_model=GenerationResponse)
 async def text_to_speech(voice_id: str, request: TextToSpeechRequest):
     """Single-speaker text-to-speech generation using Higgs."""
+    # Model is loaded at startup (or via /v1/load-model)
+    model = MODEL
+    if model is None:
+        raise HTTPException(status_code=503, detail="Higgs model not loaded")
+
     try:
         # Decode URL-encoded voice_id (filepath)
         voice_path = decode_filepath_from_url(voice_id)
@@ -283,17 +308,18 @@ async def text_to_speech(voice_id: str, request: TextToSpeechRequest):
         logger.info(f"Higgs TTS: {voice_path} -> {output_path}")
         logger.info(f"Text: {request.text}")
 
+        loop = asyncio.get_running_loop()
+
         # Resolve and check if voice file exists
         resolved_voice_path = resolve_file_path(voice_path, project_root)
-        if not os.path.exists(resolved_voice_path):
+        if not await loop.run_in_executor(
+            _IO_POOL, os.path.exists, resolved_voice_path
+        ):
             raise HTTPException(
                 status_code=400,
                 detail=f"Voice file not found: {voice_path} (resolved: {resolved_voice_path})",
             )
 
-        # Load model
-        model = get_or_load_model()
-
         # Set seed if provided
         if "seed" in request.parameters:
             seed = request.parameters["seed"]
@@ -335,7 +361,10 @@ async def text_to_speech(voice_id: str, request: TextToSpeechRequest):
             )
 
         # Create output directory if needed
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        await loop.run_in_executor(
+            _IO_POOL,
+            functools.partial(os.makedirs, os.path.dirname(output_path), exist_ok=True),
+        )
 
         # Generate audio
         response: HiggsAudioResponse = model.generate(
@@ -344,7 +373,9 @@ async def text_to_speech(voice_id: str, request: TextToSpeechRequest):
 
         # Save audio
         audio_tensor = torch.from_numpy(response.audio)[None, :]
-        torchaudio.save(output_path, audio_tensor, response.sampling_rate)
+        await loop.run_in_executor(
+            _IO_POOL, torchaudio.save, output_path, audio_tensor, response.sampling_rate
+        )
 
         logger.info(f"Higgs TTS completed: {output_path}")
         return GenerationResponse(
@@ -361,30 +392,33 @@ async def text_to_speech(voice_id: str, request: TextToSpeechRequest):
 @app.post("/v1/text-to-dialogue", response_model=GenerationResponse)
 async def text_to_dialogue(request: TextToDialogueRequest):
     """Multi-speaker dialogue generation using Higgs."""
+    # Model is loaded at startup (or via /v1/load-model)
+    model = MODEL
+    if model is None:
+        raise HTTPException(status_code=503, detail="Higgs model not loaded")
+
     try:
         if len(request.inputs) < 1:
             raise HTTPException(status_code=400, detail="At least one input required")
 
-        # Load model
-        model = get_or_load_model()
+        loop = asyncio.get_running_loop()
 
         output_path = request.output_filepath
 
         # Extract texts and voice paths
-        texts = [inp.text for inp in request.inputs]
-        voice_paths = [inp.voice_id for inp in request.inputs]
+        texts, voice_paths = map(
+            list, zip(*((inp.text, inp.voice_id) for inp in request.inputs))
+        )
 
         # Check if voice files exist
-        resolved_voice_paths = []
-        for voice_path in voice_paths:
-            resolved_path = resolve_file_path(
-                decode_filepath_from_url(voice_path), project_root
-            )
-            if not os.path.exists(resolved_path):
+        resolved_voice_paths = [
+            resolve_voice_path(voice_path, project_root) for voice_path in voice_paths
+        ]
+        for voice_path, resolved_path in zip(voice_paths, resolved_voice_paths):
+            if not path_exists(resolved_path):
                 logger.warning(
                     f"Voice file not found: {voice_path} (resolved: {resolved_path})"
                 )
-            resolved_voice_paths.append(resolved_path)
 
         # Set seed if provided
         if "seed" in request.parameters:
@@ -425,7 +459,10 @@ async def text_to_dialogue(request: TextToDialogueRequest):
             )
 
         # Create output directory if needed
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        await loop.run_in_executor(
+            _IO_POOL,
+            functools.partial(os.makedirs, os.path.dirname(output_path), exist_ok=True),
+        )
 
         # Generate audio
         response: HiggsAudioResponse = model.generate(
@@ -434,7 +471,9 @@ async def text_to_dialogue(request: TextToDialogueRequest):
 
         # Save audio
         audio_tensor = torch.from_numpy(response.audio)[None, :]
-        torchaudio.save(output_path, audio_tensor, response.sampling_rate)
+        await loop.run_in_executor(
+            _IO_POOL, torchaudio.save, output_path, audio_tensor, response.sampling_rate
+        )
 
         logger.info(f"Higgs dialogue completed: {output_path}")
         return GenerationResponse(
@@ -480,19 +519,13 @@ async def unload_model_endpoint():
 @app.get("/v1/models", response_model=OpenAIModelsResponse)
 async def list_models():
     """OpenAI-compatible models endpoint with health data."""
-    import time
-    
-    model_loaded = MODEL is not None
     model_data = OpenAIModel(
-        id=MODEL_NAME,
+        **_STATIC_MODEL_INFO,
         created=int(time.time()),
-        owned_by="custom",
         status="healthy",
-        model_loaded=model_loaded,
-        device=DEVICE,
-        dependencies_available=HIGGS_AVAILABLE,
+        model_loaded=MODEL is not None,
     )
-    
+
     return OpenAIModelsResponse(data=[model_data])
 
 
@@ -8,15 +8,20 @@ A FastAPI service that fakes AI model endpoints without requiring VRAM.
 - Follows standard API but uses no actual AI models
 """
 
+import asyncio
 import gc
 import logging
 import os
 import shutil
 import time
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, List, NamedTuple, Optional, Any
 from urllib.parse import unquote
 
-from fastapi import FastAPI, HTTPException
+import orjson
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 # Import shared models
@@ -26,10 +31,13 @@ import os
 project_root = os.path.dirname(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 )
-sys.path.append(project_root)
-print(f"Current working directory: {os.getcwd()}")
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
-from backend.core.utils.file_utils import concatenate_audio_files
+from backend.core.utils.file_utils import (
+    concatenate_audio_files,
+    stream_concatenate_audio_files,
+)
 from models.shared_models import (
     DialogueInput,
     TextToSpeechRequest,
@@ -45,7 +53,6 @@ from models.shared_models import (
 from backend.core.utils.url_utils import decode_filepath_from_url
 
 try:
-    import librosa
     import soundfile as sf
     import numpy as np
 
@@ -58,19 +65,72 @@ except ImportError as e:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Mock AI Model Service", version="1.0.0")
+from models.model_shared_utils import (
+    find_missing_paths,
+    resolve_file_path,
+    resolve_voice_path,
+)
+
+
+class ResolvedVoice(NamedTuple):
+    voice_id: str
+    text: str
+    resolved_path: str
+    exists: bool
+
 
+async def _prepare_voices(inputs: List[DialogueInput]) -> List[ResolvedVoice]:
+    """Resolve, log and existence-check every dialogue input's voice in one pass."""
+    resolved_paths = [resolve_voice_path(inp.voice_id, project_root) for inp in inputs]
+    missing = set(await find_missing_paths(resolved_paths))
 
-from models.model_shared_utils import resolve_file_path
+    voices = [
+        ResolvedVoice(inp.voice_id, inp.text, path, path not in missing)
+        for inp, path in zip(inputs, resolved_paths)
+    ]
+    if logger.isEnabledFor(logging.INFO):
+        for i, voice in enumerate(voices):
+            logger.info("  %d: %s (voice: %s)", i + 1, voice.text, voice.resolved_path)
+    return voices
 
 
-def simulate_processing_delay(parameters: Dict[str, Any], base_delay: float = 2.0):
-    logger.info(f"Simulating processing delay: {base_delay:.2f}s")
-    time.sleep(base_delay)
+async def simulate_processing_delay(
+    parameters: Dict[str, Any], base_delay: float = 2.0
+):
+    logger.info("Simulating processing delay: %.2fs", base_delay)
+    await asyncio.sleep(base_delay)
 
 
 MODEL_NAME = "Mock Service"
 
+# Persistent pool backing asyncio.to_thread, created on startup
+_IO_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+# Serialized /v1/models body, rebuilt at most once per minute
+_models_body: bytes = b""
+_models_body_minute: Optional[int] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _IO_EXECUTOR
+    # Startup
+    _IO_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="io")
+    asyncio.get_running_loop().set_default_executor(_IO_EXECUTOR)
+
+    yield
+
+    # Shutdown
+    _IO_EXECUTOR.shutdown(wait=False)
+
+
+app = FastAPI(
+    title="Mock AI Model Service",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
 
 # API Endpoints
 @app.get("/", response_model=ServiceInfoResponse)
@@ -86,8 +146,8 @@ async def text_to_speech(voice_id: str, request: TextToSpeechRequest):
         voice_path = decode_filepath_from_url(voice_id)
         output_path = request.output_filepath
 
-        logger.info(f"Mock TTS: {voice_path} -> {output_path}")
-        logger.info(f"Text: {request.text}")
+        logger.info("Mock TTS: %s -> %s", voice_path, output_path)
+        logger.info("Text: %s", request.text)
 
         # Resolve and check if voice file exists
         resolved_voice_path = resolve_file_path(voice_path, project_root)
@@ -98,15 +158,17 @@ async def text_to_speech(voice_id: str, request: TextToSpeechRequest):
             )
 
         # Simulate processing delay
-        simulate_processing_delay(request.parameters)
+        await simulate_processing_delay(request.parameters)
 
         # Create output directory if needed
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        await asyncio.to_thread(
+            os.makedirs, os.path.dirname(output_path), exist_ok=True
+        )
 
         # Copy voice file to output location
-        shutil.copy2(resolved_voice_path, output_path)
+        await asyncio.to_thread(shutil.copyfile, resolved_voice_path, output_path)
 
-        logger.info(f"Mock TTS completed: {output_path}")
+        logger.info("Mock TTS completed: %s", output_path)
         return GenerationResponse(
             status="success",
             output_filepath=output_path,
@@ -114,7 +176,7 @@ async def text_to_speech(voice_id: str, request: TextToSpeechRequest):
         )
 
     except Exception as e:
-        logger.error(f"Error in mock TTS: {e}")
+        logger.error("Error in mock TTS: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -122,40 +184,60 @@ async def text_to_speech(voice_id: str, request: TextToSpeechRequest):
 async def text_to_dialogue(request: TextToDialogueRequest):
     """Mock multi-speaker dialogue: concatenates all voice files."""
     try:
-        print("request", request)
-
-        # Extract and resolve voice paths
-        voice_paths = [
-            resolve_file_path(decode_filepath_from_url(inp.voice_id), project_root)
-            for inp in request.inputs
-        ]
         output_path = request.output_filepath
+        logger.info("Mock Dialogue: %d voices -> %s", len(request.inputs), output_path)
 
-        logger.info(f"Mock Dialogue: {len(voice_paths)} voices -> {output_path}")
-        for i, inp in enumerate(request.inputs):
-            logger.info(f"  {i+1}: {inp.text} (voice: {voice_paths[i]})")
-
-        # Check if all voice files exist
-        missing_files = [path for path in voice_paths if not os.path.exists(path)]
+        # Resolve voice paths and check that all voice files exist
+        voices = await _prepare_voices(request.inputs)
+        voice_paths = [voice.resolved_path for voice in voices]
+        missing_files = [voice.resolved_path for voice in voices if not voice.exists]
         if missing_files:
             raise HTTPException(
                 status_code=400, detail=f"Voice files not found: {missing_files}"
             )
 
         # Simulate processing delay
-        simulate_processing_delay(request.parameters)
+        await simulate_processing_delay(request.parameters)
 
         # Create output directory if needed
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        await asyncio.to_thread(
+            os.makedirs, os.path.dirname(output_path), exist_ok=True
+        )
+
+        # A single voice needs no concatenation, just copy it
+        if len(voice_paths) == 1:
+            await asyncio.to_thread(shutil.copyfile, voice_paths[0], output_path)
+            logger.info("Mock dialogue completed: %s", output_path)
+            return GenerationResponse(
+                status="success",
+                output_filepath=output_path,
+                message="Mock dialogue generation completed (copied single voice)",
+            )
 
         # Concatenate audio files
         if AUDIO_LIBS_AVAILABLE:
-            concatenated_audio = concatenate_audio_files(voice_paths)
+            # Stream straight to disk when the voices share a sample format
+            if await asyncio.to_thread(
+                stream_concatenate_audio_files, voice_paths, output_path
+            ):
+                logger.info("Mock dialogue completed: %s", output_path)
+                return GenerationResponse(
+                    status="success",
+                    output_filepath=output_path,
+                    message=f"Mock dialogue generation completed (concatenated {len(voice_paths)} voices)",
+                )
+
+            # Otherwise resample everything to a common rate in memory
+            concatenated_audio = await asyncio.to_thread(
+                concatenate_audio_files, voice_paths
+            )
 
             if concatenated_audio is not None:
                 # Save concatenated audio
-                sf.write(output_path, concatenated_audio, 44100)
-                logger.info(f"Mock dialogue completed: {output_path}")
+                await asyncio.to_thread(
+                    sf.write, output_path, concatenated_audio, 44100
+                )
+                logger.info("Mock dialogue completed: %s", output_path)
                 return GenerationResponse(
                     status="success",
                     output_filepath=output_path,
@@ -165,8 +247,8 @@ async def text_to_dialogue(request: TextToDialogueRequest):
                 raise Exception("Failed to concatenate audio files")
         else:
             # Fallback: just copy the first voice file
-            shutil.copy2(voice_paths[0], output_path)
-            logger.info(f"Mock dialogue completed (fallback): {output_path}")
+            await asyncio.to_thread(shutil.copyfile, voice_paths[0], output_path)
+            logger.info("Mock dialogue completed (fallback): %s", output_path)
             return GenerationResponse(
                 status="success",
                 output_filepath=output_path,
@@ -174,7 +256,7 @@ async def text_to_dialogue(request: TextToDialogueRequest):
             )
 
     except Exception as e:
-        logger.error(f"Error in mock dialogue: {e}")
+        logger.error("Error in mock dialogue: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -182,7 +264,7 @@ async def text_to_dialogue(request: TextToDialogueRequest):
 async def load_model():
     """Mock model loading (no-op)."""
     logger.info("Mock model load (no-op)")
-    time.sleep(1.0)  # Simulate loading time
+    await asyncio.sleep(1.0)  # Simulate loading time
     return LoadModelResponse(
         status="success", message="Mock model loaded (no actual model)"
     )
@@ -192,7 +274,7 @@ async def load_model():
 async def unload_model_endpoint():
     """Mock model unloading (no-op)."""
     logger.info("Mock model unload (no-op)")
-    time.sleep(0.5)  # Simulate unloading time
+    await asyncio.sleep(0.5)  # Simulate unloading time
     return UnloadModelResponse(
         status="success", message="Mock model unloaded (no actual model)"
     )
@@ -201,19 +283,25 @@ async def unload_model_endpoint():
 @app.get("/v1/models", response_model=OpenAIModelsResponse)
 async def list_models():
     """OpenAI-compatible models endpoint with health data."""
-    import time
-
-    model_data = OpenAIModel(
-        id=MODEL_NAME,
-        created=int(time.time()),
-        owned_by="custom",
-        status="healthy",
-        model_loaded=True,  # Always "loaded" since it's mock
-        device="cpu",  # Mock service uses no GPU
-        dependencies_available=AUDIO_LIBS_AVAILABLE,
-    )
+    global _models_body, _models_body_minute
+
+    now = int(time.time())
+    if _models_body_minute != now // 60:
+        model_data = OpenAIModel(
+            id=MODEL_NAME,
+            created=now,
+            owned_by="custom",
+            status="healthy",
+            model_loaded=True,  # Always "loaded" since it's mock
+            device="cpu",  # Mock service uses no GPU
+            dependencies_available=AUDIO_LIBS_AVAILABLE,
+        )
+        _models_body = orjson.dumps(
+            OpenAIModelsResponse(data=[model_data]).model_dump()
+        )
+        _models_body_minute = now // 60
 
-    return OpenAIModelsResponse(data=[model_data])
+    return Response(content=_models_body, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -249,8 +337,8 @@ if __name__ == "__main__":
     # Patch the simulate_processing_delay function to use our global delay
     original_simulate_delay = simulate_processing_delay
 
-    def patched_simulate_delay(parameters):
-        return original_simulate_delay(parameters, global_base_delay)
+    async def patched_simulate_delay(parameters):
+        return await original_simulate_delay(parameters, global_base_delay)
 
     # Replace the function globally
     globals()["simulate_processing_delay"] = patched_simulate_delay
@@ -1,22 +1,93 @@
+import asyncio
+import functools
+import logging
 import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List
 
 from backend.core.utils.logger import get_logger
+from backend.core.utils.url_utils import decode_filepath_from_url
 
 logger = get_logger(__name__)
 
 
+_isabs = os.path.isabs
+_join = os.path.join
+
+
 # File path resolution
+@functools.lru_cache(maxsize=4096)
 def resolve_file_path(file_path: str, project_root: str) -> str:
-    print(f"Resolving file path, starting with  : {file_path}")
     """
     Resolve file paths relative to project root.
     Services run from models/model_name/ but files are at project root.
     """
-    if os.path.isabs(file_path):
+    if _isabs(file_path):
         return file_path
 
     # Get project root (two directories up from service)
-    resolved_path = os.path.join(project_root, file_path)
+    resolved_path = _join(project_root, file_path)
 
-    logger.debug(f"Resolved {file_path} -> {resolved_path}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Resolved {file_path} -> {resolved_path}")
     return resolved_path
+
+
+@functools.lru_cache(maxsize=256)
+def resolve_voice_path(voice_id: str, project_root: str) -> str:
+    """Decode a URL-encoded voice id and resolve it relative to project root."""
+    return resolve_file_path(decode_filepath_from_url(voice_id), project_root)
+
+
+# Paths recently confirmed to exist, with the time of the check, most recent last
+_EXISTS_CACHE_SIZE = 256
+_EXISTS_CACHE: "OrderedDict[str, float]" = OrderedDict()
+_EXISTS_CACHE_LOCK = threading.Lock()
+
+
+def path_exists(path: str, ttl: int = 60) -> bool:
+    """
+    os.path.exists, remembering positive results for up to `ttl` seconds.
+    Misses are never cached, so a file created after a failed check is seen
+    straight away.
+    """
+    now = time.monotonic()
+    with _EXISTS_CACHE_LOCK:
+        checked = _EXISTS_CACHE.get(path)
+        if checked is not None and now - checked < ttl:
+            return True
+
+    exists = os.path.exists(path)
+
+    with _EXISTS_CACHE_LOCK:
+        if exists:
+            _EXISTS_CACHE[path] = now
+            _EXISTS_CACHE.move_to_end(path)
+            while len(_EXISTS_CACHE) > _EXISTS_CACHE_SIZE:
+                _EXISTS_CACHE.popitem(last=False)
+        else:
+            _EXISTS_CACHE.pop(path, None)
+    return exists
+
+
+async def find_missing_paths(paths: List[str]) -> List[str]:
+    """Return the paths that don't exist, stat-ing each unique path concurrently."""
+    unique_paths = list(dict.fromkeys(paths))
+    exists = await asyncio.gather(
+        *(asyncio.to_thread(path_exists, path) for path in unique_paths)
+    )
+    return [path for path, ok in zip(unique_paths, exists) if not ok]
+
+
+def get_speaker_mapping(voice_paths: List[str]) -> List[int]:
+    """
+    Map each voice path to a dense speaker index (0..k-1), numbered in order of
+    first appearance.
+    """
+    voice_to_speaker = {}
+    return [
+        voice_to_speaker.setdefault(voice_path, len(voice_to_speaker))
+        for voice_path in voice_paths
+    ]
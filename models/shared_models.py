@@ -6,7 +6,7 @@ microservices should use to maintain API consistency.
 """
 
 from typing import Dict, List, Optional, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 # Request Models
@@ -22,7 +22,7 @@ class TextToSpeechRequest(BaseModel):
 
     text: str
     output_filepath: str
-    parameters: Optional[Dict[str, Any]] = {}
+    parameters: Optional[Dict[str, Any]] = Field(default_factory=dict)
     audio_transcriptions: List[str]
 
 
@@ -31,7 +31,7 @@ class TextToDialogueRequest(BaseModel):
 
     inputs: List[DialogueInput]
     output_filepath: str
-    parameters: Optional[Dict[str, Any]] = {}
+    parameters: Optional[Dict[str, Any]] = Field(default_factory=dict)
     voice_clone_paths: List[str]
     audio_transcriptions: List[str]
 
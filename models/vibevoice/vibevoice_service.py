@@ -7,26 +7,40 @@ Supports both single-speaker TTS and multi-speaker dialogue generation.
 """
 
 import argparse
+import asyncio
+import functools
 import gc
 import importlib
 import importlib.metadata
+import importlib.util
+import itertools
 import logging
 import os
 import re
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from urllib.parse import unquote
 
 import torch
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 default_cfg_scale = 1.6
+# Dialogues longer than this are split into chunks generated as one batch
+default_max_chunk_chars = 1000
 
 # Import shared models
 import sys
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+models_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if models_dir not in sys.path:
+    sys.path.append(models_dir)
 from shared_models import (
     DialogueInput,
     TextToSpeechRequest,
@@ -43,7 +57,8 @@ from shared_models import (
 project_root = os.path.dirname(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 )
-sys.path.append(project_root)
+if project_root not in sys.path:
+    sys.path.append(project_root)
 from backend.core.utils.url_utils import decode_filepath_from_url
 
 try:
@@ -69,10 +84,33 @@ MODEL = None
 PROCESSOR = None
 MODEL_PATH = "microsoft/VibeVoice-1.5b"  # Default model
 MODEL_NAME = "VibeVoice"  # Will be updated based on model variant
+COMPILE_MODEL = False  # Set by --compile
+QUANTIZATION = "none"  # Set by --quantize
+
+# Decoded voice samples keyed on (path, mtime), most recent last
+_VOICE_CACHE_SIZE = 128
+_VOICE_CACHE = OrderedDict()
+_VOICE_CACHE_LOCK = threading.Lock()
+
+# Model jobs (generation, load, unload), run one at a time by the worker
+# started in the app lifespan
+JOB_QUEUE: Optional[asyncio.Queue] = None
+JOBS: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+MAX_TRACKED_JOBS = 1000
+_WORKER_TASK = None
+_IO_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+# Allow TF32 tensor cores for any fp32 matmuls left in the model
+torch.backends.cuda.matmul.allow_tf32 = True
+torch.set_float32_matmul_precision("high")
+
+from model_shared_utils import (
+    find_missing_paths,
+    resolve_file_path,
+    resolve_voice_path,
+)
 
-app = FastAPI(title="VibeVoice Audio Generation Service", version="1.0.0")
-
-from model_shared_utils import resolve_file_path
+_SPEAKER_RE = re.compile(r"\[?Speaker\s*\d+\]?:", re.IGNORECASE)
 
 
 def is_torch_available():
@@ -87,6 +125,7 @@ def _is_package_available(package_name):
         return False
 
 
+@functools.cache
 def is_flash_attn_2_available():
     try:
         if not is_torch_available():
@@ -106,6 +145,65 @@ def is_flash_attn_2_available():
         return False
 
 
+_HAS_FLASH_ATTN_2 = is_flash_attn_2_available()
+
+
+# Package (and minimum version) each --quantize mode needs on top of requirements.txt.
+# fp8 passes a Float8WeightOnlyConfig object to TorchAoConfig, which needs torchao 0.10+
+QUANTIZATION_PACKAGES = {"int8": ("bitsandbytes", None), "fp8": ("torchao", (0, 10))}
+
+
+def check_quantization_dependencies(quantization):
+    """Fail at startup, rather than on first load, if the quantization backend is missing."""
+    if quantization not in QUANTIZATION_PACKAGES:
+        return
+    package, min_version = QUANTIZATION_PACKAGES[quantization]
+    requirement = package
+    if min_version:
+        requirement += ">=" + ".".join(map(str, min_version))
+
+    if importlib.util.find_spec(package) is not None:
+        if min_version is None:
+            return
+        match = re.match(r"(\d+)\.(\d+)", importlib.metadata.version(package))
+        if match and tuple(map(int, match.groups())) >= min_version:
+            return
+
+    raise SystemExit(
+        f"--quantize {quantization} needs {requirement}, "
+        f"install it into this model's venv with: pip install '{requirement}'"
+    )
+
+
+def get_quantization_config():
+    """Build the from_pretrained quantization_config for --quantize, if any."""
+    if QUANTIZATION == "none":
+        return None
+
+    if not torch.cuda.is_available():
+        logger.warning(f"--quantize {QUANTIZATION} needs CUDA, loading unquantized")
+        return None
+
+    if QUANTIZATION == "int8":
+        from transformers import BitsAndBytesConfig
+
+        return BitsAndBytesConfig(load_in_8bit=True)
+
+    if QUANTIZATION == "fp8":
+        # FP8 kernels need Ada (sm_89) or Hopper
+        if torch.cuda.get_device_capability() < (8, 9):
+            logger.warning("FP8 needs an Ada/Hopper GPU, loading unquantized")
+            return None
+        from torchao.quantization import Float8WeightOnlyConfig
+        from transformers import TorchAoConfig
+
+        # transformers 4.51 only accepts int4/int8 quant_type strings, so pass
+        # the torchao config object instead
+        return TorchAoConfig(Float8WeightOnlyConfig())
+
+    raise ValueError(f"Unknown quantization: {QUANTIZATION}")
+
+
 def get_or_load_model():
     """Load the VibeVoice model and processor."""
     global MODEL, PROCESSOR
@@ -122,7 +220,7 @@ def get_or_load_model():
         PROCESSOR = VibeVoiceProcessor.from_pretrained(MODEL_PATH)
 
         # Load model
-        if is_flash_attn_2_available():
+        if _HAS_FLASH_ATTN_2:
             logger.info("Flash attention 2 is available!")
             attn_implementation = "flash_attention_2"
         else:
@@ -134,11 +232,26 @@ def get_or_load_model():
             torch_dtype=torch.bfloat16,
             device_map="cuda" if torch.cuda.is_available() else "cpu",
             attn_implementation=attn_implementation,
+            quantization_config=get_quantization_config(),
         )
 
+        # Release allocator blocks left over from loading
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
         MODEL.eval()
         MODEL.set_ddpm_inference_steps(num_steps=10)
 
+        if COMPILE_MODEL and torch.cuda.is_available():
+            # Compile the hot forwards in place: generate() calls self(...) and
+            # the diffusion head directly, so wrapping MODEL itself in
+            # torch.compile would leave both uncompiled. Sequence lengths
+            # grow every step, hence dynamic shapes.
+            logger.info("Compiling VibeVoice forward passes with torch.compile...")
+            head = MODEL.model.prediction_head
+            MODEL.forward = torch.compile(MODEL.forward, dynamic=True)
+            head.forward = torch.compile(head.forward, dynamic=True)
+
         logger.info(f"VibeVoice model loaded on device: {DEVICE}")
 
     return MODEL, PROCESSOR
@@ -187,33 +300,311 @@ def prepare_multi_speaker_script(
     voice_clone_paths: Optional[List[str]] = None,
 ) -> str:
     """Prepare script for multi-speaker generation."""
-    formatted_parts = []
+    # Leave texts that already carry speaker tags untouched
+    return "\n".join(
+        text if _SPEAKER_RE.search(text) else f"Speaker {i + 1}: {text.strip()}"
+        for i, text in enumerate(texts)
+    )
+
 
-    for i, text in enumerate(texts):
-        speaker_num = i + 1
-        # Check if text already has speaker tags
-        if not re.search(r"\[?Speaker\s*\d+\]?:", text, re.IGNORECASE):
-            text = f"Speaker {speaker_num}: {text.strip()}"
-        formatted_parts.append(text)
+def _pack_turns(
+    texts: List[str],
+    voice_samples: List[str],
+    max_chars: int = default_max_chunk_chars,
+):
+    """
+    Greedily pack consecutive dialogue turns into chunks of at most `max_chars`
+    characters, preserving turn order. A single longer turn gets its own chunk.
+
+    Returns (scripts, voice_samples) with one entry per batch item.
+    """
+    scripts, batch_voice_samples = [], []
+    chunk_texts, chunk_voices, chunk_len = [], [], 0
+
+    for text, voice in zip(texts, voice_samples):
+        if chunk_texts and chunk_len + len(text) > max_chars:
+            scripts.append(prepare_multi_speaker_script(chunk_texts))
+            batch_voice_samples.append(chunk_voices)
+            chunk_texts, chunk_voices, chunk_len = [], [], 0
+        chunk_texts.append(text)
+        chunk_voices.append(voice)
+        chunk_len += len(text)
+
+    if chunk_texts:
+        scripts.append(prepare_multi_speaker_script(chunk_texts))
+        batch_voice_samples.append(chunk_voices)
+
+    return scripts, batch_voice_samples
+
+
+def load_voice_sample(processor, voice_path: str):
+    """
+    Decode a voice sample with the processor's loader, reusing recently decoded
+    samples. Unreadable paths are returned as-is for the processor to report.
+    """
+    try:
+        key = (voice_path, os.stat(voice_path).st_mtime_ns)
+    except OSError:
+        return voice_path
 
-    return "\n".join(formatted_parts)
+    with _VOICE_CACHE_LOCK:
+        if key in _VOICE_CACHE:
+            _VOICE_CACHE.move_to_end(key)
+            return _VOICE_CACHE[key]
 
+    wav = processor.audio_processor._load_audio_from_path(voice_path)
 
-def get_voice_samples_from_paths(voice_paths: List[str]) -> List[str]:
+    with _VOICE_CACHE_LOCK:
+        _VOICE_CACHE[key] = wav
+        _VOICE_CACHE.move_to_end(key)
+        while len(_VOICE_CACHE) > _VOICE_CACHE_SIZE:
+            _VOICE_CACHE.popitem(last=False)
+
+    return wav
+
+
+async def get_voice_samples_from_paths(voice_paths: List[str]) -> List[str]:
     """Convert voice paths to resolved file paths for VibeVoice."""
-    resolved_paths = []
-    for voice_path in voice_paths:
-        resolved_path = resolve_file_path(
-            decode_filepath_from_url(voice_path), project_root
-        )
-        if not os.path.exists(resolved_path):
-            logger.warning(
-                f"Voice file not found: {voice_path} (resolved: {resolved_path})"
-            )
-        resolved_paths.append(resolved_path)
+    resolved_paths = [
+        resolve_voice_path(voice_path, project_root) for voice_path in voice_paths
+    ]
+    for resolved_path in await find_missing_paths(resolved_paths):
+        logger.warning("Voice file not found: %s", resolved_path)
     return resolved_paths
 
 
+def set_seed(parameters: Dict[str, Any]):
+    """Seed torch if the request asks for a specific seed."""
+    if "seed" in parameters:
+        seed = parameters["seed"]
+        torch.manual_seed(seed)
+        if torch.cuda.is_available():
+            torch.cuda.manual_seed(seed)
+
+
+def generate_speech(request: TextToSpeechRequest, resolved_voice_path: str) -> str:
+    """Blocking single-speaker generation; runs on the generation worker."""
+    # Load model and processor
+    model, processor = get_or_load_model()
+
+    set_seed(request.parameters)
+
+    # Prepare script for single speaker
+    script = prepare_single_speaker_script(request.text)
+
+    # Prepare inputs for the model
+    inputs = processor(
+        text=[script],  # Wrap in list for batch processing
+        voice_samples=[
+            [load_voice_sample(processor, resolved_voice_path)]
+        ],  # Single voice sample for single speaker
+        padding=True,
+        return_tensors="pt",
+        return_attention_mask=True,
+    )
+
+    # Generation parameters
+    cfg_scale = request.parameters.get("cfg_scale", default_cfg_scale)
+
+    # Create output directory if needed
+    os.makedirs(os.path.dirname(request.output_filepath), exist_ok=True)
+
+    # Generate audio
+    with torch.inference_mode():
+        outputs = model.generate(
+            **inputs,
+            max_new_tokens=None,
+            cfg_scale=cfg_scale,
+            tokenizer=processor.tokenizer,
+            generation_config={"do_sample": False},
+            verbose=False,
+        )
+
+    # Save audio
+    processor.save_audio(
+        outputs.speech_outputs[0],  # First (and only) batch item
+        output_path=request.output_filepath,
+    )
+
+    logger.info("VibeVoice TTS completed: %s", request.output_filepath)
+    return "VibeVoice TTS generation completed"
+
+
+def generate_dialogue(
+    request: TextToDialogueRequest, texts: List[str], voice_paths: List[str]
+) -> str:
+    """Blocking multi-speaker generation; runs on the generation worker."""
+    # Load model and processor
+    model, processor = get_or_load_model()
+
+    # Get decoded voice samples
+    voice_samples = [load_voice_sample(processor, path) for path in voice_paths]
+
+    set_seed(request.parameters)
+
+    # Pack the dialogue into balanced chunks, generated as one batch
+    max_chunk_chars = request.parameters.get(
+        "max_chunk_chars", default_max_chunk_chars
+    )
+    scripts, batch_voice_samples = _pack_turns(texts, voice_samples, max_chunk_chars)
+
+    # Prepare inputs for the model
+    inputs = processor(
+        text=scripts,
+        voice_samples=batch_voice_samples,
+        padding=True,
+        return_tensors="pt",
+        return_attention_mask=True,
+    )
+
+    # Generation parameters
+    cfg_scale = request.parameters.get("cfg_scale", 1.0)
+
+    # Create output directory if needed
+    os.makedirs(os.path.dirname(request.output_filepath), exist_ok=True)
+
+    # Generate audio
+    with torch.inference_mode():
+        outputs = model.generate(
+            **inputs,
+            max_new_tokens=None,
+            cfg_scale=cfg_scale,
+            tokenizer=processor.tokenizer,
+            generation_config={"do_sample": False},
+            verbose=False,
+        )
+
+    # Stitch the chunks back together in dialogue order
+    # A chunk without audio would silently drop lines from the dialogue
+    missing = [i for i, s in enumerate(outputs.speech_outputs) if s is None]
+    if missing:
+        raise Exception(
+            f"VibeVoice generated no audio for chunk(s) {missing} of {len(scripts)}"
+        )
+
+    # Save audio
+    processor.save_audio(
+        torch.cat(outputs.speech_outputs, dim=-1),
+        output_path=request.output_filepath,
+    )
+
+    logger.info("VibeVoice dialogue completed: %s", request.output_filepath)
+    return f"VibeVoice dialogue generation completed ({len(texts)} segments)"
+
+
+def _update_job(job_id: Optional[str], **fields):
+    """Update a tracked job, unless it is untracked or already evicted."""
+    job = JOBS.get(job_id) if job_id is not None else None
+    if job is not None:
+        job.update(fields)
+
+
+async def generation_worker():
+    """Run queued model jobs one at a time, off the event loop."""
+    while True:
+        job_id, job_fn, args, future = await JOB_QUEUE.get()
+        try:
+            _update_job(job_id, status="running")
+            result = await asyncio.to_thread(job_fn, *args)
+            _update_job(job_id, status="success", message=result)
+            if future is not None and not future.done():
+                future.set_result(result)
+        except Exception as e:
+            logger.error("Error in VibeVoice job %s: %s", job_id, e)
+            _update_job(job_id, status="error", message=str(e))
+            if future is not None and not future.done():
+                future.set_exception(e)
+        finally:
+            JOB_QUEUE.task_done()
+
+
+async def run_on_worker(job_fn, *args):
+    """
+    Run job_fn on the generation worker and wait for its result, so model
+    loads/unloads never overlap a running generation.
+    """
+    future = asyncio.get_running_loop().create_future()
+    await JOB_QUEUE.put((None, job_fn, args, future))
+    return await future
+
+
+def _evict_finished_jobs():
+    """
+    Forget the oldest finished jobs beyond MAX_TRACKED_JOBS. Pending and
+    running jobs are always kept, so they can still be polled.
+    """
+    excess = len(JOBS) - MAX_TRACKED_JOBS
+    if excess <= 0:
+        return
+    finished = (
+        job_id
+        for job_id, job in JOBS.items()
+        if job["status"] in ("success", "error")
+    )
+    for job_id in list(itertools.islice(finished, excess)):
+        del JOBS[job_id]
+
+
+async def enqueue_generation(
+    generate_fn, request, *args, response: Response
+) -> GenerationResponse:
+    """
+    Queue a generation job. Waits for it to finish unless the request sets the
+    "background" parameter, in which case 202 is returned straight away and
+    the job can be polled at /v1/jobs/{id}.
+    """
+    job_id = uuid.uuid4().hex
+    JOBS[job_id] = {
+        "status": "pending",
+        "output_filepath": request.output_filepath,
+        "message": None,
+    }
+    _evict_finished_jobs()
+
+    background = request.parameters.get("background", False)
+    future = None if background else asyncio.get_running_loop().create_future()
+    await JOB_QUEUE.put((job_id, generate_fn, (request, *args), future))
+
+    if background:
+        response.status_code = 202
+        return GenerationResponse(
+            status="pending",
+            output_filepath=request.output_filepath,
+            message=f"Job {job_id} queued",
+        )
+
+    message = await future
+    return GenerationResponse(
+        status="success", output_filepath=request.output_filepath, message=message
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global JOB_QUEUE, _WORKER_TASK, _IO_EXECUTOR
+    # Startup: persistent pool backing asyncio.to_thread (disk I/O and
+    # generation), and the worker that runs every model job
+    _IO_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="io")
+    asyncio.get_running_loop().set_default_executor(_IO_EXECUTOR)
+
+    JOB_QUEUE = asyncio.Queue()
+    _WORKER_TASK = asyncio.create_task(generation_worker())
+
+    yield
+
+    # Shutdown
+    _WORKER_TASK.cancel()
+    _IO_EXECUTOR.shutdown(wait=False)
+
+
+app = FastAPI(
+    title="VibeVoice Audio Generation Service",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+
 # API Endpoints
 @app.get("/", response_model=ServiceInfoResponse)
 async def root():
@@ -221,7 +612,9 @@ async def root():
 
 
 @app.post("/v1/text-to-speech/{voice_id}", response_model=GenerationResponse)
-async def text_to_speech(voice_id: str, request: TextToSpeechRequest):
+async def text_to_speech(
+    voice_id: str, request: TextToSpeechRequest, response: Response
+):
     """Single-speaker text-to-speech generation using VibeVoice."""
     try:
         # Decode URL-encoded voice_id (filepath)
@@ -229,8 +622,8 @@ async def text_to_speech(voice_id: str, request: TextToSpeechRequest):
 
         output_path = request.output_filepath
 
-        logger.info(f"VibeVoice TTS: {voice_path} -> {output_path}")
-        logger.info(f"Text: {request.text}")
+        logger.info("VibeVoice TTS: %s -> %s", voice_path, output_path)
+        logger.info("Text: %s", request.text)
 
         # Resolve and check if voice file exists
         resolved_voice_path = resolve_file_path(voice_path, project_root)
@@ -240,141 +633,57 @@ async def text_to_speech(voice_id: str, request: TextToSpeechRequest):
                 detail=f"Voice file not found: {voice_path} (resolved: {resolved_voice_path})",
             )
 
-        # Load model and processor
-        model, processor = get_or_load_model()
-
-        # Set seed if provided
-        if "seed" in request.parameters:
-            seed = request.parameters["seed"]
-            torch.manual_seed(seed)
-            if torch.cuda.is_available():
-                torch.cuda.manual_seed(seed)
-
-        # Prepare script for single speaker
-        script = prepare_single_speaker_script(request.text)
-
-        # Prepare inputs for the model
-        inputs = processor(
-            text=[script],  # Wrap in list for batch processing
-            voice_samples=[
-                [resolved_voice_path]
-            ],  # Single voice sample for single speaker
-            padding=True,
-            return_tensors="pt",
-            return_attention_mask=True,
-        )
-
-        # Generation parameters
-        cfg_scale = request.parameters.get("cfg_scale", default_cfg_scale)
-
-        # Create output directory if needed
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-        # Generate audio
-        outputs = model.generate(
-            **inputs,
-            max_new_tokens=None,
-            cfg_scale=cfg_scale,
-            tokenizer=processor.tokenizer,
-            generation_config={"do_sample": False},
-            verbose=False,
-        )
-
-        # Save audio
-        processor.save_audio(
-            outputs.speech_outputs[0],  # First (and only) batch item
-            output_path=output_path,
-        )
-
-        logger.info(f"VibeVoice TTS completed: {output_path}")
-        return GenerationResponse(
-            status="success",
-            output_filepath=output_path,
-            message="VibeVoice TTS generation completed",
+        return await enqueue_generation(
+            generate_speech, request, resolved_voice_path, response=response
         )
 
     except Exception as e:
-        logger.error(f"Error in VibeVoice TTS: {e}")
+        logger.error("Error in VibeVoice TTS: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/v1/text-to-dialogue", response_model=GenerationResponse)
-async def text_to_dialogue(request: TextToDialogueRequest):
+async def text_to_dialogue(request: TextToDialogueRequest, response: Response):
     """Multi-speaker dialogue generation using VibeVoice."""
     try:
         if len(request.inputs) < 1:
             raise HTTPException(status_code=400, detail="At least one input required")
 
-        # Load model and processor
-        model, processor = get_or_load_model()
-
-        output_path = request.output_filepath
-
         # Extract texts and voice paths
-        texts = [inp.text for inp in request.inputs]
-        voice_paths = [inp.voice_id for inp in request.inputs]
-
-        # Get resolved voice samples
-        voice_samples = get_voice_samples_from_paths(voice_paths)
-
-        # Set seed if provided
-        if "seed" in request.parameters:
-            seed = request.parameters["seed"]
-            torch.manual_seed(seed)
-            if torch.cuda.is_available():
-                torch.cuda.manual_seed(seed)
-
-        # Prepare script for multi-speaker
-        full_script = prepare_multi_speaker_script(texts, voice_paths)
-
-        # Prepare inputs for the model
-        inputs = processor(
-            text=[full_script],  # Wrap in list for batch processing
-            voice_samples=[voice_samples],  # Wrap in list for batch processing
-            padding=True,
-            return_tensors="pt",
-            return_attention_mask=True,
-        )
-
-        # Generation parameters
-        cfg_scale = request.parameters.get("cfg_scale", 1.0)
-
-        # Create output directory if needed
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-        # Generate audio
-        outputs = model.generate(
-            **inputs,
-            max_new_tokens=None,
-            cfg_scale=cfg_scale,
-            tokenizer=processor.tokenizer,
-            generation_config={"do_sample": False},
-            verbose=False,
+        texts, voice_paths = map(
+            list, zip(*((inp.text, inp.voice_id) for inp in request.inputs))
         )
 
-        # Save audio
-        processor.save_audio(
-            outputs.speech_outputs[0],  # First (and only) batch item
-            output_path=output_path,
-        )
+        # Get resolved voice sample paths
+        resolved_voice_paths = await get_voice_samples_from_paths(voice_paths)
 
-        logger.info(f"VibeVoice dialogue completed: {output_path}")
-        return GenerationResponse(
-            status="success",
-            output_filepath=output_path,
-            message=f"VibeVoice dialogue generation completed ({len(texts)} segments)",
+        return await enqueue_generation(
+            generate_dialogue,
+            request,
+            texts,
+            resolved_voice_paths,
+            response=response,
         )
 
     except Exception as e:
-        logger.error(f"Error in VibeVoice dialogue: {e}")
+        logger.error("Error in VibeVoice dialogue: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/v1/jobs/{job_id}", response_model=GenerationResponse)
+async def get_job(job_id: str):
+    """Status of a queued generation job."""
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return GenerationResponse(**job)
+
+
 @app.post("/v1/load-model", response_model=LoadModelResponse)
 async def load_model():
     """Preload the VibeVoice model."""
     try:
-        get_or_load_model()
+        await run_on_worker(get_or_load_model)
         return LoadModelResponse(
             status="success", message="VibeVoice model loaded successfully"
         )
@@ -387,7 +696,7 @@ async def load_model():
 async def unload_model_endpoint():
     """Unload the VibeVoice model and free memory."""
     try:
-        success = unload_model()
+        success = await run_on_worker(unload_model)
         if success:
             return UnloadModelResponse(
                 status="success", message="VibeVoice model unloaded successfully"
@@ -402,8 +711,6 @@ async def unload_model_endpoint():
 @app.get("/v1/models", response_model=OpenAIModelsResponse)
 async def list_models():
     """OpenAI-compatible models endpoint with health data."""
-    import time
-
     model_loaded = MODEL is not None and PROCESSOR is not None
     model_data = OpenAIModel(
         id=MODEL_NAME,
@@ -426,12 +733,25 @@ def parse_args():
         action="store_true",
         help="Use VibeVoice Large (7B) model instead of the default 1.5B model",
     )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="Compile the model with torch.compile (CUDA only, slow first request)",
+    )
+    parser.add_argument(
+        "--quantize",
+        choices=["none", "int8", "fp8"],
+        default="none",
+        help="Load weights quantized: int8 (bitsandbytes) or fp8 (torchao>=0.10, Ada/Hopper)",
+    )
     return parser.parse_args()
 
 
-def configure_model(use_large=False):
+def configure_model(use_large=False, compile_model=False, quantization="none"):
     """Configure model path and name based on variant."""
-    global MODEL_PATH, MODEL_NAME
+    global MODEL_PATH, MODEL_NAME, COMPILE_MODEL, QUANTIZATION
+    COMPILE_MODEL = compile_model
+    QUANTIZATION = quantization
     if use_large:
         MODEL_PATH = "vibevoice/VibeVoice-7B"
         MODEL_NAME = "VibeVoice 7B"
@@ -447,7 +767,10 @@ if __name__ == "__main__":
     args = parse_args()
 
     # Configure model based on arguments
-    configure_model(use_large=args.large)
+    configure_model(
+        use_large=args.large, compile_model=args.compile, quantization=args.quantize
+    )
+    check_quantization_dependencies(args.quantize)
 
     logger.info(f"Starting {MODEL_NAME} service with model: {MODEL_PATH}")
 
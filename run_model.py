@@ -12,32 +12,136 @@ This script will:
 4. Run the model service
 """
 
+import functools
+import hashlib
+import json
 import os
 import sys
 import subprocess
 import platform
 import shutil
+import signal
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+PLATFORM = platform.system()
+IS_WINDOWS = PLATFORM == "Windows"
+IS_MACOS = PLATFORM == "Darwin"
+
+CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "bookforge"
+)
+PYTHON_CACHE_FILE = CACHE_DIR / "python.json"
+
+# Distributions whose presence means a venv's dependencies are installed
+REQUIRED_DISTRIBUTIONS = ("fastapi", "transformers")
+
+# Written into the venv after a successful install, see compute_install_stamp
+INSTALL_STAMP_NAME = ".bookforge-stamp"
+
+# Shared venv that new model venvs are hardlink-cloned from (POSIX only)
+BASE_VENV_DIR = Path(__file__).parent / ".venv-base"
+
+# Keep pip non-interactive and skip its self-update check on every call
+PIP_BASE_ARGS = ["--no-input", "--disable-pip-version-check"]
+
+# Prefetched wheels shared by all model venvs, pruned to the last install's set
+WHEELHOUSE_DIR = CACHE_DIR / "wheelhouse"
+
+# uv cache shared by all model venvs, on the same filesystem for hardlinks
+INSTALL_CACHE_DIR = Path(__file__).parent / ".uv-cache"
+
+# Background flash_attn install bookkeeping, kept inside the venv
+FLASH_PID_NAME = ".flash-install.pid"
+FLASH_LOG_NAME = "flash-install.log"
+FLASH_STAMP_NAME = ".flash-attn-installed"
+
+# Detached service started with --daemon, kept in the model directory
+DAEMON_PID_NAME = ".daemon.pid"
+DAEMON_LOG_NAME = "daemon.log"
+
+
+def _path_env_hash():
+    """Hash of PATH, so a cached interpreter is dropped when PATH changes."""
+    return hashlib.blake2b(os.environ.get("PATH", "").encode()).hexdigest()
+
+
+def _load_cached_python():
+    """Return the cached interpreter path if it is still valid, else None."""
+    try:
+        cached = json.loads(PYTHON_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+
+    path = cached.get("path")
+    if (
+        path
+        and cached.get("path_env_hash") == _path_env_hash()
+        and os.path.exists(path)
+    ):
+        return path
+    return None
+
+
+def _save_cached_python(path):
+    """Remember the chosen interpreter for later runs (best effort)."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        PYTHON_CACHE_FILE.write_text(
+            json.dumps({"path": path, "path_env_hash": _path_env_hash()})
+        )
+    except OSError:
+        pass
+
+
+def _probe_python(candidate):
+    """Return True if candidate runs and reports Python 3.10+."""
+    try:
+        result = subprocess.run(
+            [candidate, "--version"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=2,
+        )
+    except (
+        subprocess.CalledProcessError,
+        subprocess.TimeoutExpired,
+        FileNotFoundError,
+    ):
+        return False
+
+    version_line = result.stdout.strip()
+    return "Python 3.1" in version_line  # 3.10, 3.11, 3.12, etc.
+
+
 def get_python_executable():
     """Find the best Python 3.10+ executable."""
+    cached = _load_cached_python()
+    if cached:
+        return cached
+
     # Try different Python executables in order of preference
     candidates = ["python3.10", "python3.11", "python3.12", "python3", "python"]
 
-    for candidate in candidates:
-        try:
-            result = subprocess.run(
-                [candidate, "--version"], capture_output=True, text=True, check=True
-            )
-            version_line = result.stdout.strip()
-            if "Python 3.1" in version_line:  # 3.10, 3.11, 3.12, etc.
-                return candidate
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            continue
+    # Probe all candidates at once, but take results in preference order
+    executor = ThreadPoolExecutor(max_workers=len(candidates))
+    try:
+        futures = [executor.submit(_probe_python, c) for c in candidates]
+        for candidate, future in zip(candidates, futures):
+            if future.result():
+                path = shutil.which(candidate) or candidate
+                _save_cached_python(path)
+                return path
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
     # Fallback - try current Python
     if sys.version_info >= (3, 10):
+        _save_cached_python(sys.executable)
         return sys.executable
 
     print("Error: Python 3.10+ not found.")
@@ -45,11 +149,12 @@ def get_python_executable():
     sys.exit(1)
 
 
+@functools.lru_cache(maxsize=None)
 def get_venv_paths(model_dir):
     """Get virtual environment paths for the current platform."""
     venv_dir = model_dir / "venv"
 
-    if platform.system() == "Windows":
+    if IS_WINDOWS:
         python_exe = venv_dir / "Scripts" / "python.exe"
         pip_exe = venv_dir / "Scripts" / "pip.exe"
     else:
@@ -59,14 +164,94 @@ def get_venv_paths(model_dir):
     return venv_dir, python_exe, pip_exe
 
 
-def create_venv(model_dir, python_exe):
-    """Create virtual environment."""
+def _get_or_build_base_venv(system_python):
+    """
+    Return the shared base venv that new model venvs are cloned from,
+    building it with system_python first if needed. Returns None on failure.
+    """
+    base_python = BASE_VENV_DIR / "bin" / "python"
+    marker = BASE_VENV_DIR / ".base-python"
+
+    try:
+        if base_python.exists() and marker.read_text() == system_python:
+            return BASE_VENV_DIR
+    except OSError:
+        pass
+
+    print(f"Building base virtual environment at {BASE_VENV_DIR}")
+    shutil.rmtree(BASE_VENV_DIR, ignore_errors=True)
+    try:
+        subprocess.run([system_python, "-m", "venv", str(BASE_VENV_DIR)], check=True)
+        marker.write_text(system_python)
+        return BASE_VENV_DIR
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"Failed to build base virtual environment: {e}")
+        shutil.rmtree(BASE_VENV_DIR, ignore_errors=True)
+        return None
+
+
+def _clone_venv(base_dir, venv_dir):
+    """
+    Clone base_dir into venv_dir using hardlinks, then rewrite the files that
+    embed the venv's own path (activate scripts, shebangs, pyvenv.cfg).
+    """
+    replacements = [
+        (str(base_dir).encode(), str(venv_dir).encode()),
+        (f"({base_dir.name}) ".encode(), f"({venv_dir.name}) ".encode()),
+    ]
+
+    try:
+        shutil.copytree(base_dir, venv_dir, symlinks=True, copy_function=os.link)
+
+        for path in [venv_dir / "pyvenv.cfg", *(venv_dir / "bin").iterdir()]:
+            if path.is_symlink() or not path.is_file():
+                continue
+            content = path.read_bytes()
+            patched = content
+            for old, new in replacements:
+                patched = patched.replace(old, new)
+            if patched == content:
+                continue
+            # Break the hardlink before writing so the base stays untouched
+            mode = path.stat().st_mode
+            path.unlink()
+            path.write_bytes(patched)
+            path.chmod(mode)
+
+        (venv_dir / ".base-python").unlink(missing_ok=True)
+        return True
+    except OSError as e:
+        print(f"Could not clone base virtual environment: {e}")
+        shutil.rmtree(venv_dir, ignore_errors=True)
+        return False
+
+
+def create_venv(model_dir, get_system_python):
+    """
+    Create virtual environment. get_system_python is called to find the
+    interpreter to build it with.
+    """
     venv_dir, _, _ = get_venv_paths(model_dir)
+    python_exe = get_system_python()
 
     print(f"Creating virtual environment at {venv_dir}")
 
+    uv = shutil.which("uv")
+    if uv:
+        # --seed installs pip so check_venv_health still works
+        cmd = [uv, "venv", "--seed", "--python", python_exe, str(venv_dir)]
+    else:
+        # Hardlink-clone the shared base venv (POSIX only) instead of
+        # running venv + ensurepip for every model
+        if not IS_WINDOWS:
+            base_dir = _get_or_build_base_venv(python_exe)
+            if base_dir and _clone_venv(base_dir, venv_dir):
+                print("Virtual environment created from base template")
+                return True
+        cmd = [python_exe, "-m", "venv", str(venv_dir)]
+
     try:
-        subprocess.run([python_exe, "-m", "venv", str(venv_dir)], check=True)
+        subprocess.run(cmd, check=True)
         print("Virtual environment created successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -74,15 +259,29 @@ def create_venv(model_dir, python_exe):
         return False
 
 
-def check_venv_health(model_dir):
-    """Check if the virtual environment is healthy (has pip)."""
-    _, python_exe, _ = get_venv_paths(model_dir)
+def check_venv_health(model_dir, deep=False):
+    """
+    Check if the virtual environment is healthy (has python, pip and
+    pyvenv.cfg). With deep=True, also make sure pip actually runs.
+    """
+    venv_dir, python_exe, pip_exe = get_venv_paths(model_dir)
+
+    if not (
+        python_exe.is_file()
+        and pip_exe.is_file()
+        and (venv_dir / "pyvenv.cfg").is_file()
+    ):
+        return False
+
+    if not deep:
+        return True
 
     try:
         # Test if pip is available
         result = subprocess.run(
             [str(python_exe), "-m", "pip", "--version"],
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             cwd=model_dir,
         )
         return result.returncode == 0
@@ -90,6 +289,242 @@ def check_venv_health(model_dir):
         return False
 
 
+def get_site_packages_dirs(venv_dir):
+    """Return the venv's site-packages directories that exist on disk."""
+    if IS_WINDOWS:
+        candidates = [venv_dir / "Lib" / "site-packages"]
+    else:
+        candidates = venv_dir.glob("lib/python3*/site-packages")
+    return [d for d in candidates if d.is_dir()]
+
+
+def dependencies_installed(model_dir):
+    """
+    Check that the main dependencies are installed in the venv, looking for
+    their dist-info metadata instead of importing them.
+    """
+    venv_dir, python_exe, _ = get_venv_paths(model_dir)
+
+    site_dirs = get_site_packages_dirs(venv_dir)
+    if site_dirs:
+        return all(
+            any(next(d.glob(f"{name}-*.dist-info"), None) for d in site_dirs)
+            for name in REQUIRED_DISTRIBUTIONS
+        )
+
+    # Unusual venv layout, ask the venv's interpreter for the metadata instead
+    names = ", ".join(repr(name) for name in REQUIRED_DISTRIBUTIONS)
+    result = subprocess.run(
+        [
+            str(python_exe),
+            "-c",
+            f"import importlib.metadata as m; [m.distribution(n) for n in ({names},)]",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        cwd=model_dir,
+    )
+    return result.returncode == 0
+
+
+def _has_nvidia_gpu():
+    """Best-effort check for an NVIDIA driver, without importing anything."""
+    return bool(
+        shutil.which("nvidia-smi") or os.path.exists("/proc/driver/nvidia/version")
+    )
+
+
+def get_torch_index_url():
+    """Return the PyTorch wheel index to install from, or "" for PyPI."""
+    override = os.environ.get("BOOKFORGE_TORCH_INDEX")
+    if override is not None:
+        return override
+
+    # macOS wheels on PyPI are already CPU/MPS only
+    if not IS_MACOS and not _has_nvidia_gpu():
+        return "https://download.pytorch.org/whl/cpu"
+    if IS_WINDOWS:
+        return "https://download.pytorch.org/whl/cu118"
+    return ""
+
+
+def compute_install_stamp(model_dir):
+    """Fingerprint of everything that decides what install_dependencies does."""
+    requirements_file = model_dir / "requirements.txt"
+    return "|".join(
+        [
+            hashlib.sha256(requirements_file.read_bytes()).hexdigest(),
+            PLATFORM,
+            get_torch_index_url(),
+        ]
+    )
+
+
+def read_install_stamp(venv_dir):
+    try:
+        return (venv_dir / INSTALL_STAMP_NAME).read_text()
+    except OSError:
+        return None
+
+
+def write_install_stamp(venv_dir, stamp):
+    try:
+        (venv_dir / INSTALL_STAMP_NAME).write_text(stamp)
+    except OSError as e:
+        print(f"Warning: could not write install stamp: {e}")
+
+
+def get_install_env():
+    """
+    Environment for pip/uv installs. uv gets a cache next to the model venvs
+    (unless the user configured their own) so --link-mode=hardlink can link
+    installed files into it; pip keeps its usual per-user cache.
+    """
+    env = os.environ.copy()
+    env.setdefault("UV_CACHE_DIR", str(INSTALL_CACHE_DIR))
+    env.setdefault("PIP_NO_INPUT", "1")
+    env.setdefault("PIP_DISABLE_PIP_VERSION_CHECK", "1")
+    return env
+
+
+def install_dependencies_uv(model_dir, uv):
+    """Install PyTorch and requirements.txt with uv."""
+    _, python_exe, _ = get_venv_paths(model_dir)
+
+    base_cmd = [
+        uv, "pip", "install",
+        "--python", str(python_exe),
+        "--link-mode", "hardlink",
+    ]
+    torch_packages = ["torch", "torchvision", "torchaudio"]
+    torch_url = get_torch_index_url()
+
+    try:
+        if torch_url:
+            # PyTorch must come only from its own index, otherwise a newer
+            # (CPU-only) build on PyPI wins, so it gets a separate step
+            print(f"Installing PyTorch from {torch_url}...")
+            subprocess.run(
+                base_cmd + torch_packages + ["--index-url", torch_url],
+                check=True,
+                cwd=model_dir,
+                env=get_install_env(),
+            )
+            subprocess.run(
+                base_cmd + ["-r", "requirements.txt"],
+                check=True,
+                cwd=model_dir,
+                env=get_install_env(),
+            )
+        else:
+            subprocess.run(
+                base_cmd + ["-r", "requirements.txt"] + torch_packages,
+                check=True,
+                cwd=model_dir,
+                env=get_install_env(),
+            )
+        print("Dependencies installed successfully")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"Failed to install dependencies: {e}")
+        return False
+
+
+def _sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _download_wheel(url, sha256, dest, timeout=60):
+    """
+    Make sure dest holds the wheel at url. A copy already in the wheelhouse
+    is reused when its sha256 matches, otherwise the wheel is downloaded.
+    """
+    if dest.exists() and (not sha256 or _sha256_file(dest) == sha256):
+        return
+
+    # Unique per process, since model installs may share the wheelhouse
+    partial = dest.with_name(f"{dest.name}.{os.getpid()}.part")
+    try:
+        # timeout bounds each socket read, so a stalled connection fails
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            with open(partial, "wb") as f:
+                shutil.copyfileobj(response, f, 1 << 20)
+        if sha256 and _sha256_file(partial) != sha256:
+            raise ValueError(f"Hash mismatch for {dest.name}")
+        partial.replace(dest)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def prefetch_wheels(model_dir, install_args, max_workers=8):
+    """
+    Make sure every wheel pip would install is in the shared wheelhouse,
+    downloading missing ones several at a time instead of pip's one-by-one
+    downloads.
+
+    Returns the wheel paths if every distribution is available locally as a
+    wheel, else None (in which case pip just downloads as usual). This is
+    best effort only.
+    """
+    _, python_exe, _ = get_venv_paths(model_dir)
+
+    # Let pip resolve without installing, reporting what it would download
+    try:
+        result = subprocess.run(
+            [
+                str(python_exe), "-m", "pip", "install", *PIP_BASE_ARGS,
+                "--dry-run", "--quiet", "--report", "-",
+            ] + install_args,
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=model_dir,
+            env=get_install_env(),
+        )
+        report = json.loads(result.stdout)
+    except (subprocess.CalledProcessError, ValueError):
+        return None
+
+    downloads = []
+    for item in report.get("install", []):
+        info = item.get("download_info", {})
+        if "archive_info" not in info:
+            return None  # VCS or local directory requirement
+        url = info["url"]
+        sha256 = info["archive_info"].get("hashes", {}).get("sha256")
+        filename = urllib.parse.unquote(url.rsplit("/", 1)[-1].split("#")[0])
+        if not filename.endswith(".whl"):
+            # sdists need build dependencies, which --no-index can't fetch
+            return None
+        downloads.append((url, sha256, WHEELHOUSE_DIR / filename))
+
+    if not downloads:
+        return None
+
+    WHEELHOUSE_DIR.mkdir(parents=True, exist_ok=True)
+    print(f"Prefetching {len(downloads)} packages...")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_download_wheel, *d) for d in downloads]
+        failed = [f.exception() for f in futures if f.exception() is not None]
+
+    if failed:
+        print(f"Prefetch incomplete ({failed[0]}), letting pip download")
+        return None
+    return [dest for _, _, dest in downloads]
+
+
+def prune_wheelhouse(keep):
+    """Remove wheels from the shared wheelhouse that are not in keep."""
+    keep = {path.name for path in keep}
+    for path in WHEELHOUSE_DIR.glob("*.whl"):
+        if path.name not in keep:
+            path.unlink(missing_ok=True)
+
+
 def install_dependencies(model_dir):
     """Install dependencies in the virtual environment."""
     _, python_exe, pip_exe = get_venv_paths(model_dir)
@@ -101,33 +536,88 @@ def install_dependencies(model_dir):
 
     print("Installing dependencies...")
 
+    uv = shutil.which("uv")
+    if uv:
+        return install_dependencies_uv(model_dir, uv)
+
+    # PyTorch must come only from its own index, otherwise a newer (CPU-only)
+    # build on PyPI wins, so it can't share a pip run with requirements.txt
+    if get_torch_index_url():
+        return install_dependencies_sequential(model_dir)
+
+    try:
+        # Upgrade pip on its own: --upgrade applies to every named package
+        subprocess.run(
+            [
+                str(python_exe), "-m", "pip", "install", *PIP_BASE_ARGS,
+                "--upgrade", "pip",
+            ],
+            check=True,
+            cwd=model_dir,
+            env=get_install_env(),
+        )
+    except subprocess.CalledProcessError as e:
+        print(f"Failed to install dependencies: {e}")
+        return False
+
+    # Resolve PyTorch and requirements.txt in one pip run
+    install_args = ["torch", "torchvision", "torchaudio", "-r", "requirements.txt"]
+    cmd = [str(python_exe), "-m", "pip", "install", *PIP_BASE_ARGS] + install_args
+    wheels = prefetch_wheels(model_dir, install_args)
+    if wheels:
+        # Everything is on disk already, so pip doesn't need the network
+        cmd += ["--no-index", "--find-links", str(WHEELHOUSE_DIR)]
+
+    try:
+        subprocess.run(cmd, check=True, cwd=model_dir, env=get_install_env())
+        print("Dependencies installed successfully")
+        if wheels:
+            prune_wheelhouse(wheels)
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"Combined install failed ({e}), retrying step by step...")
+
+    return install_dependencies_sequential(model_dir)
+
+
+def install_dependencies_sequential(model_dir):
+    """Install pip, PyTorch and requirements.txt one after another."""
+    _, python_exe, pip_exe = get_venv_paths(model_dir)
+
     try:
         # Upgrade pip first
         subprocess.run(
-            [str(python_exe), "-m", "pip", "install", "--upgrade", "pip"],
+            [
+                str(python_exe), "-m", "pip", "install", *PIP_BASE_ARGS,
+                "--upgrade", "pip",
+            ],
             check=True,
             cwd=model_dir,
+            env=get_install_env(),
         )
 
         # Install PyTorch with CUDA support on Windows
-        if platform.system() == "Windows":
-            print("Installing PyTorch with CUDA support for Windows...")
+        torch_url = get_torch_index_url()
+        if torch_url:
+            print(f"Installing PyTorch from {torch_url}...")
             subprocess.run([
-                str(pip_exe), "install", 
+                str(pip_exe), "install", *PIP_BASE_ARGS,
                 "torch", "torchvision", "torchaudio", 
-                "--index-url", "https://download.pytorch.org/whl/cu118"
-            ], check=True, cwd=model_dir)
+                "--index-url", torch_url
+            ], check=True, cwd=model_dir, env=get_install_env())
         else:
             # On Linux/Mac, default installation usually works
             subprocess.run([
-                str(pip_exe), "install", "torch", "torchvision", "torchaudio"
-            ], check=True, cwd=model_dir)
+                str(pip_exe), "install", *PIP_BASE_ARGS,
+                "torch", "torchvision", "torchaudio"
+            ], check=True, cwd=model_dir, env=get_install_env())
 
         # Install requirements
         subprocess.run(
-            [str(pip_exe), "install", "-r", "requirements.txt"],
+            [str(pip_exe), "install", *PIP_BASE_ARGS, "-r", "requirements.txt"],
             check=True,
             cwd=model_dir,
+            env=get_install_env(),
         )
 
         print("Dependencies installed successfully")
@@ -137,6 +627,81 @@ def install_dependencies(model_dir):
         return False
 
 
+def _process_alive(pid):
+    """Return True if a process with this pid is still running."""
+    if IS_WINDOWS:
+        result = subprocess.run(
+            ["tasklist", "/FI", f"PID eq {pid}", "/NH"],
+            capture_output=True,
+            text=True,
+        )
+        return str(pid) in result.stdout
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def start_flash_attn_install(model_dir):
+    """
+    Install flash_attn in a background pip process so the service can start
+    straight away. flash_attn is only picked up when the service (re)starts.
+    """
+    venv_dir, _, pip_exe = get_venv_paths(model_dir)
+    stamp_file = venv_dir / FLASH_STAMP_NAME
+    pid_file = venv_dir / FLASH_PID_NAME
+    log_file = venv_dir / FLASH_LOG_NAME
+
+    if stamp_file.exists():
+        return
+
+    if any(
+        next(d.glob("flash_attn-*.dist-info"), None)
+        for d in get_site_packages_dirs(venv_dir)
+    ):
+        stamp_file.touch()
+        pid_file.unlink(missing_ok=True)
+        print("flash_attn installed")
+        return
+
+    try:
+        pid = int(pid_file.read_text())
+    except (OSError, ValueError):
+        pid = None
+
+    if pid is not None:
+        if _process_alive(pid):
+            print(f"flash_attn is still compiling in the background (pid {pid})")
+            print(f"Progress is logged to {log_file}")
+            return
+        print(f"Previous flash_attn install did not succeed, see {log_file}")
+
+    print("Installing flash_attn for vibevoice model in the background...")
+    try:
+        with open(log_file, "ab") as log_f:
+            process = subprocess.Popen(
+                [
+                    str(pip_exe), "install", *PIP_BASE_ARGS,
+                    "flash-attn>=2.0", "--no-build-isolation",
+                ],
+                cwd=model_dir,
+                env=get_install_env(),
+                stdout=log_f,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        pid_file.write_text(str(process.pid))
+        print(f"Logging to {log_file}")
+        print("Restart the service once it finishes to enable flash attention")
+    except OSError as e:
+        print(f"Warning: Failed to start flash_attn install: {e}")
+        print("The service may still work, but performance might be reduced")
+
+
 def run_service(model_dir, service_file, extra_args=None):
     """Run the model service."""
     _, python_exe, _ = get_venv_paths(model_dir)
@@ -150,14 +715,100 @@ def run_service(model_dir, service_file, extra_args=None):
     print("Press Ctrl+C to stop the service (service is still starting)")
     print("-" * 50)
 
+    # Run the service with extra arguments
+    cmd = [str(python_exe), str(service_file)] + extra_args
+
+    if not IS_WINDOWS:
+        # Replace this process with the service, so signals go straight to it
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.chdir(model_dir)
+        os.execv(str(python_exe), cmd)
+
+    process = subprocess.Popen(cmd, cwd=model_dir)
     try:
-        # Run the service with extra arguments
-        cmd = [str(python_exe), str(service_file)] + extra_args
-        subprocess.run(cmd, cwd=model_dir, check=True)
+        returncode = process.wait()
+        if returncode != 0:
+            print(f"Service failed with exit code {returncode}")
     except KeyboardInterrupt:
         print("\nService stopped by user")
-    except subprocess.CalledProcessError as e:
-        print(f"Service failed: {e}")
+    finally:
+        # Never leave the service running without its launcher
+        if process.poll() is None:
+            process.kill()
+
+
+def get_daemon(model_dir):
+    """Return (pid, service args) of this model's running daemon, or None."""
+    try:
+        daemon = json.loads((model_dir / DAEMON_PID_NAME).read_text())
+        pid, args = int(daemon["pid"]), list(daemon["args"])
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+    return (pid, args) if _process_alive(pid) else None
+
+
+def stop_daemon(model_dir):
+    """Stop this model's daemon, if any. Returns True if one was running."""
+    daemon = get_daemon(model_dir)
+    if daemon is not None:
+        pid, _ = daemon
+        if IS_WINDOWS:
+            subprocess.run(
+                ["taskkill", "/PID", str(pid), "/T", "/F"], capture_output=True
+            )
+        else:
+            # The daemon leads its own session, so this also stops its children
+            try:
+                os.killpg(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    (model_dir / DAEMON_PID_NAME).unlink(missing_ok=True)
+    return daemon is not None
+
+
+def start_daemon(model_dir, service_file, extra_args):
+    """
+    Start the service detached from this terminal, so it stays up (with its
+    imports and model weights loaded) across run_model.py invocations.
+    """
+    _, python_exe, _ = get_venv_paths(model_dir)
+    log_file = model_dir / DAEMON_LOG_NAME
+
+    if IS_WINDOWS:
+        detach = {
+            "creationflags": subprocess.DETACHED_PROCESS
+            | subprocess.CREATE_NEW_PROCESS_GROUP
+        }
+    else:
+        detach = {"start_new_session": True}
+
+    cmd = [str(python_exe), str(service_file)] + extra_args
+    with open(log_file, "ab") as log_f:
+        process = subprocess.Popen(
+            cmd,
+            cwd=model_dir,
+            stdin=subprocess.DEVNULL,
+            stdout=log_f,
+            stderr=subprocess.STDOUT,
+            **detach,
+        )
+    (model_dir / DAEMON_PID_NAME).write_text(
+        json.dumps({"pid": process.pid, "args": extra_args})
+    )
+
+    print(f"Started {service_file.stem} in the background (pid {process.pid})")
+    print(f"Logging to {log_file}")
+    print(f"Stop it with: python run_model.py {model_dir.name} --stop")
+
+
+def find_service_file(model_dir):
+    """Return the first *_service.py file in model_dir, or None."""
+    with os.scandir(model_dir) as it:
+        for entry in it:
+            if entry.name.endswith("_service.py") and entry.is_file():
+                return Path(entry.path)
+    return None
 
 
 def main():
@@ -165,39 +816,90 @@ def main():
         print("Usage: python run_model.py <model_name> [additional_args...]")
         print("Example: python run_model.py dia")
         print("Example: python run_model.py mock --fast-delay")
+        print("Example: python run_model.py dia --skip-setup")
+        print("Example: python run_model.py dia --daemon")
+        print("Example: python run_model.py dia --stop")
         sys.exit(1)
 
     model_name = sys.argv[1]
     extra_args = sys.argv[2:]  # Pass through any additional arguments
+    skip_setup = os.environ.get("BOOKFORGE_SKIP_SETUP") == "1"
+    if "--skip-setup" in extra_args:
+        extra_args = [arg for arg in extra_args if arg != "--skip-setup"]
+        skip_setup = True
+    daemon = "--daemon" in extra_args
+    if daemon:
+        extra_args = [arg for arg in extra_args if arg != "--daemon"]
+    stop = "--stop" in extra_args
     script_dir = Path(__file__).parent
     model_dir = script_dir / "models" / model_name
 
     # Check if model exists
     if not model_dir.exists():
         print(f"Model '{model_name}' not found in models/ directory")
-        available_models = [
-            d.name for d in (script_dir / "models").iterdir() if d.is_dir()
-        ]
+        with os.scandir(script_dir / "models") as it:
+            available_models = [entry.name for entry in it if entry.is_dir()]
         if available_models:
             print(f"Available models: {', '.join(available_models)}")
         sys.exit(1)
 
     # Find service file
-    service_files = list(model_dir.glob("*_service.py"))
-    if not service_files:
+    service_file = find_service_file(model_dir)
+    if service_file is None:
         print(f"No service file found in {model_dir}")
         print("Expected a file ending with '_service.py'")
         sys.exit(1)
 
-    service_file = service_files[0]
     venv_dir, python_exe, pip_exe = get_venv_paths(model_dir)
 
+    if stop:
+        if stop_daemon(model_dir):
+            print(f"Stopped the {model_name} service")
+        else:
+            print(f"No {model_name} service is running in the background")
+        return
+
+    # A running daemon already has everything imported and loaded
+    running = get_daemon(model_dir)
+    if running is not None:
+        pid, running_args = running
+        stop_hint = f"python run_model.py {model_name} --stop"
+        if not daemon:
+            # A second service would only fail to bind the same port
+            print(
+                f"{model_name} service is already running in the background "
+                f"(pid {pid}), stop it first with: {stop_hint}"
+            )
+            sys.exit(1)
+        print(f"{model_name} service is already running (pid {pid})")
+        if running_args != extra_args:
+            print(
+                f"Warning: it was started with arguments "
+                f"[{' '.join(running_args)}], the new arguments "
+                f"[{' '.join(extra_args)}] are ignored"
+            )
+            print(f"To use the new arguments, stop it first with: {stop_hint}")
+        return
+
+    # Fast path: trust a previously completed setup and start right away
+    if skip_setup:
+        if (venv_dir / INSTALL_STAMP_NAME).is_file() and python_exe.is_file():
+            if daemon:
+                start_daemon(model_dir, service_file, extra_args)
+            else:
+                run_service(model_dir, service_file, extra_args)
+            return
+        print("No completed setup found, running full setup")
+
     print(f"Setting up {model_name} model")
     print(f"Model directory: {model_dir}")
 
-    # Find Python executable
-    system_python = get_python_executable()
-    print(f"Using Python: {system_python}")
+    # Find Python executable, only if a venv actually needs creating
+    @functools.cache
+    def system_python():
+        python = get_python_executable()
+        print(f"Using Python: {python}")
+        return python
 
     # Check if venv exists and is healthy
     if not venv_dir.exists():
@@ -208,8 +910,6 @@ def main():
         print("Virtual environment found, checking health...")
         if not check_venv_health(model_dir):
             print("Virtual environment is corrupted, recreating...")
-            import shutil
-
             shutil.rmtree(venv_dir)
             if not create_venv(model_dir, system_python):
                 sys.exit(1)
@@ -219,41 +919,41 @@ def main():
     # Check if dependencies are installed
     requirements_file = model_dir / "requirements.txt"
     if requirements_file.exists():
-        try:
-            # Quick check if main dependencies are installed
-            result = subprocess.run(
-                [str(python_exe), "-c", "import fastapi, transformers"],
-                capture_output=True,
-                cwd=model_dir,
-            )
-            if result.returncode != 0:
-                print("Dependencies missing or outdated, installing...")
-                if not install_dependencies(model_dir):
-                    sys.exit(1)
-            else:
-                print("Dependencies already installed")
-        except Exception:
-            print("Installing dependencies...")
-            if not install_dependencies(model_dir):
+        stamp = compute_install_stamp(model_dir)
+        installed_stamp = read_install_stamp(venv_dir)
+        if installed_stamp == stamp:
+            print("Dependencies already installed (requirements unchanged)")
+        else:
+            try:
+                # Quick check if main dependencies are installed
+                if installed_stamp is not None:
+                    print("Requirements changed, reinstalling dependencies...")
+                    needs_install = True
+                elif not dependencies_installed(model_dir):
+                    print("Dependencies missing or outdated, installing...")
+                    needs_install = True
+                else:
+                    print("Dependencies already installed")
+                    needs_install = False
+            except Exception:
+                print("Installing dependencies...")
+                needs_install = True
+
+            if needs_install and not install_dependencies(model_dir):
                 sys.exit(1)
+            # Also stamp venvs installed before stamps existed, so they reach
+            # the fast path (and --skip-setup) from now on
+            write_install_stamp(venv_dir, stamp)
 
     # Special handling for vibevoice model - install flash_attn
     if model_name == "vibevoice":
-        _, python_exe, pip_exe = get_venv_paths(model_dir)
-        print("Installing flash_attn for vibevoice model...")
-        try:
-            subprocess.run(
-                [str(pip_exe), "install", "flash-attn>=2.0", "--no-build-isolation"],
-                check=True,
-                cwd=model_dir,
-            )
-            print("flash_attn installed successfully")
-        except subprocess.CalledProcessError as e:
-            print(f"Warning: Failed to install flash_attn: {e}")
-            print("The service may still work, but performance might be reduced")
+        start_flash_attn_install(model_dir)
 
     # Run the service
-    run_service(model_dir, service_file, extra_args)
+    if daemon:
+        start_daemon(model_dir, service_file, extra_args)
+    else:
+        run_service(model_dir, service_file, extra_args)
 
 
 if __name__ == "__main__":